@@ -0,0 +1,185 @@
+# asset_manager.py
+"""
+Центральная загрузка текстур:
+- дедупликация: каждый файл декодируется один раз, каждый (файл, размер) масштабируется один раз;
+- preload() декодирует пачку файлов в пуле потоков;
+- lazy() откладывает загрузку редко нужных текстур до первого обращения;
+- если собран пакет ассетов (asset_pack.py) и он актуален — текстуры берутся из него;
+- timings — сколько миллисекунд ушло на каждый файл (для разбора холодного старта).
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple
+
+import pygame
+
+from asset_pack import AssetPack
+from gfx import prepare_surface
+from settings import BASE_DIR, ASSET_LOADER_WORKERS, ASSET_PACK_ENABLED, ASSET_PACK_DIR
+
+logger = logging.getLogger(__name__)
+
+Size = Tuple[int, int]
+
+
+def _resolve(path: str) -> str:
+    # относительные пути считаются от корня проекта, а не от текущего каталога
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return os.path.normpath(path)
+
+
+class AssetManager:
+    def __init__(self, workers: int = ASSET_LOADER_WORKERS,
+                 pack_dir: Optional[str] = ASSET_PACK_DIR if ASSET_PACK_ENABLED else None):
+        self.workers = workers
+        self._decoded: Dict[str, Optional[pygame.Surface]] = {}
+        self._scaled: Dict[Tuple[str, Size, bool, bool], Optional[pygame.Surface]] = {}
+        self._packed: Dict[Tuple[str, Optional[Size], bool, bool], pygame.Surface] = {}
+        self._lock = threading.Lock()
+        # путь (или путь@ШxВ) -> миллисекунды на декодирование (масштабирование)
+        self.timings: Dict[str, float] = {}
+        # все запрошенные через image() ключи — по ним собирается пакет
+        self.requested: Set[Tuple[str, Optional[Size], bool, bool]] = set()
+
+        self.pack: Optional[AssetPack] = None
+        if pack_dir:
+            t0 = time.perf_counter()
+            self.pack = AssetPack.open(pack_dir)
+            if self.pack is not None:
+                self.timings["<pack>"] = (time.perf_counter() - t0) * 1000.0
+
+    # ======= Декодирование =======
+
+    def _decode(self, path: str) -> Optional[pygame.Surface]:
+        """Читает файл без конвертации (можно вызывать из рабочих потоков)."""
+        t0 = time.perf_counter()
+        try:
+            surf = pygame.image.load(path)
+        except Exception:
+            logger.warning(f"Failed to load image at {path}")
+            surf = None
+        with self._lock:
+            self.timings[path] = (time.perf_counter() - t0) * 1000.0
+        return surf
+
+    def _store(self, path: str, surf: Optional[pygame.Surface], alpha: bool) -> Optional[pygame.Surface]:
+        if surf is not None:
+            surf = prepare_surface(surf, alpha)
+        self._decoded[path] = surf
+        return surf
+
+    def preload(self, paths: Iterable[str], alpha: bool = True) -> None:
+        """Декодирует еще не загруженные файлы параллельно в пуле потоков."""
+        if self.pack is not None:
+            return  # все, что игра запрашивала при сборке, уже лежит в пакете; остальное — по требованию
+        todo = []
+        for path in paths:
+            path = _resolve(path)
+            if path not in self._decoded and path not in todo and os.path.exists(path):
+                todo.append(path)
+        if not todo:
+            return
+        t0 = time.perf_counter()
+        if self.workers > 1 and len(todo) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                decoded = list(pool.map(self._decode, todo))
+        else:
+            decoded = [self._decode(p) for p in todo]
+        # convert()/convert_alpha() — в главном потоке
+        for path, surf in zip(todo, decoded):
+            self._store(path, surf, alpha)
+        logger.info("AssetManager: preloaded %d files in %.1f ms", len(todo), (time.perf_counter() - t0) * 1000.0)
+
+    # ======= Доступ =======
+
+    def exists(self, path: str) -> bool:
+        path = _resolve(path)
+        return self._decoded.get(path) is not None or os.path.exists(path)
+
+    def image(self, path: str, size: Optional[Size] = None, alpha: bool = True,
+              smooth: bool = True) -> Optional[pygame.Surface]:
+        """
+        Текстура из кэша (None, если файла нет или он не читается).
+        size — масштабировать (smooth: smoothscale или scale). Результат общий — не изменять.
+        """
+        path = _resolve(path)
+        key = (path, tuple(size) if size is not None else None, smooth, alpha)
+        self.requested.add(key)
+        if self.pack is not None:
+            surf = self._from_pack(key)
+            if surf is not None:
+                return surf
+
+        if path in self._decoded:
+            surf = self._decoded[path]
+        else:
+            surf = self._store(path, self._decode(path) if os.path.exists(path) else None, alpha)
+        if surf is None or size is None or surf.get_size() == tuple(size):
+            return surf
+
+        if key not in self._scaled:
+            t0 = time.perf_counter()
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            self._scaled[key] = scale(surf, size)
+            self.timings[f"{path}@{size[0]}x{size[1]}"] = (time.perf_counter() - t0) * 1000.0
+        return self._scaled[key]
+
+    def _from_pack(self, key) -> Optional[pygame.Surface]:
+        surf = self._packed.get(key)
+        if surf is None:
+            surf = self.pack.surface(*key)
+            if surf is not None:
+                surf = prepare_surface(surf, key[3])
+                self._packed[key] = surf
+        return surf
+
+    def lazy(self, path: str, size: Optional[Size] = None, alpha: bool = True,
+             smooth: bool = True) -> Callable[[], Optional[pygame.Surface]]:
+        """Отложенная загрузка: файл читается при первом вызове результата."""
+        return lambda: self.image(path, size, alpha, smooth)
+
+    # ======= Статистика =======
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+
+    def report(self, top: int = 10) -> str:
+        items = sorted(self.timings.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        lines = [f"Ассеты: {len(self._decoded)} файлов, {len(self._scaled)} масштабирований, "
+                 f"{len(self._packed)} из пакета, {self.total_ms:.1f} мс"]
+        lines += [f"  {ms:7.2f} мс  {name if name.startswith('<') else os.path.relpath(name, BASE_DIR)}"
+                  for name, ms in items]
+        return "\n".join(lines)
+
+
+class LazyMapping(Mapping):
+    """Словарь, значения которого вычисляются при первом обращении к ключу."""
+    def __init__(self, loaders: Dict, eager: Iterable = ()):
+        self._loaders = dict(loaders)
+        self._values: Dict = {}
+        for key in eager:
+            self[key]
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    def loaded(self) -> Dict:
+        """Только уже загруженные значения."""
+        return dict(self._values)
+
+
+# общий экземпляр на процесс
+assets = AssetManager()
@@ -0,0 +1,190 @@
+# asset_pack.py
+"""
+Предсобранный пакет ассетов: все текстуры, которые запрашивает игра
+(уже масштабированные блоки и стадии повреждений, кирки, иконки, фон),
+лежат одним файлом сырых пикселей (RGBA/RGB) + компактный индекс.
+
+На старте файл отображается в память (mmap), поверхности создаются
+прямо из буфера — без декодирования PNG и smoothscale.
+Если исходные PNG изменились (mtime/размер) — пакет считается устаревшим,
+и AssetManager грузит файлы как обычно.
+
+Сборка (после изменения ассетов или размеров в settings.py):
+
+    python -m asset_pack
+    python -m asset_pack --check
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import pygame
+
+from settings import BASE_DIR, ASSET_PACK_DIR
+
+logger = logging.getLogger(__name__)
+
+PACK_VERSION = 1
+DATA_FILE = "assets.pack"
+INDEX_FILE = "assets.index.json"
+
+# (абсолютный путь, размер или None, smooth, alpha) — как в AssetManager.image()
+Key = Tuple[str, Optional[Tuple[int, int]], bool, bool]
+
+
+def _rel(path: str) -> str:
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, "/")
+
+
+def _abs(rel: str) -> str:
+    return os.path.normpath(os.path.join(BASE_DIR, rel))
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetPack:
+    """Открытый пакет: индекс в памяти, пиксели — в mmap (живет, пока жив процесс)."""
+    def __init__(self, directory: str, index: Dict, data: mmap.mmap):
+        self.directory = directory
+        self._data = data
+        self._view = memoryview(data)
+        self.sources: Dict[str, Tuple[int, int]] = {
+            _abs(rel): tuple(stamp) for rel, stamp in index["sources"].items()
+        }
+        self._entries: Dict[Key, Tuple[int, int, int, str]] = {}
+        for e in index["entries"]:
+            size = tuple(e["size"]) if e["size"] is not None else None
+            key = (_abs(e["path"]), size, e["smooth"], e["alpha"])
+            self._entries[key] = (e["offset"], e["w"], e["h"], e["fmt"])
+
+    @classmethod
+    def open(cls, directory: str = ASSET_PACK_DIR) -> Optional["AssetPack"]:
+        """Пакет из каталога; None, если его нет, он другой версии или устарел."""
+        index_path = os.path.join(directory, INDEX_FILE)
+        data_path = os.path.join(directory, DATA_FILE)
+        if not (os.path.exists(index_path) and os.path.exists(data_path)):
+            return None
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != PACK_VERSION:
+                logger.warning("Пакет ассетов другой версии (%s) — грузим PNG", index.get("version"))
+                return None
+            with open(data_path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Пакет ассетов не читается (%s) — грузим PNG", e)
+            return None
+        pack = cls(directory, index, data)
+        if pack.is_stale():
+            logger.warning("Пакет ассетов устарел (изменены исходные PNG) — грузим PNG; "
+                           "пересобрать: python -m asset_pack")
+            return None
+        return pack
+
+    def is_stale(self) -> bool:
+        return any(_stamp(path) != stamp for path, stamp in self.sources.items())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries
+
+    def surface(self, path: str, size: Optional[Tuple[int, int]], smooth: bool,
+                alpha: bool) -> Optional[pygame.Surface]:
+        """Поверхность поверх буфера пакета (без копирования); None — такой записи нет."""
+        entry = self._entries.get((path, size, smooth, alpha))
+        if entry is None:
+            return None
+        offset, w, h, fmt = entry
+        n = w * h * len(fmt)
+        return pygame.image.frombuffer(self._view[offset:offset + n], (w, h), fmt)
+
+
+# ======= Сборка =======
+
+def _warm_up():
+    """Поднимает игру без окна и запрашивает все текстуры, которые она может загрузить."""
+    from asset_manager import assets
+    from enums import BlockType, PickaxeType
+    from game import Game
+
+    assets.pack = None  # собираем из исходных PNG
+    pygame.font.init()
+    game = Game()
+    for bt in BlockType:
+        game.block_system.type_to_images[bt]
+    for pt in PickaxeType:
+        for size in ("small", "large"):
+            game.pickaxe.activate(pt, size)
+    return assets
+
+
+def write_pack(directory: str, surfaces: Iterable[Tuple[Key, pygame.Surface]]) -> Dict:
+    """Пишет пакет (атомарно: через временные файлы); возвращает индекс."""
+    os.makedirs(directory, exist_ok=True)
+    data_path = os.path.join(directory, DATA_FILE)
+    index_path = os.path.join(directory, INDEX_FILE)
+    entries = []
+    sources = {}
+    offset = 0
+    with open(data_path + ".tmp", "wb") as f:
+        for (path, size, smooth, alpha), surf in surfaces:
+            fmt = "RGBA" if alpha else "RGB"
+            raw = pygame.image.tobytes(surf, fmt)
+            f.write(raw)
+            w, h = surf.get_size()
+            entries.append({"path": _rel(path), "size": list(size) if size else None,
+                            "smooth": smooth, "alpha": alpha,
+                            "offset": offset, "w": w, "h": h, "fmt": fmt})
+            offset += len(raw)
+            sources[_rel(path)] = list(_stamp(path))
+    index = {"version": PACK_VERSION, "bytes": offset, "sources": sources, "entries": entries}
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(data_path + ".tmp", data_path)
+    os.replace(index_path + ".tmp", index_path)
+    return index
+
+
+def build(directory: str = ASSET_PACK_DIR) -> Dict:
+    assets = _warm_up()
+    keys = sorted(assets.requested, key=lambda k: (k[0], k[1] or (0, 0), k[2], k[3]))
+    surfaces = []
+    for key in keys:
+        surf = assets.image(*key)
+        if surf is not None:
+            surfaces.append((key, surf))
+    return write_pack(directory, surfaces)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сборка пакета ассетов")
+    parser.add_argument("--dir", default=ASSET_PACK_DIR, help="куда писать пакет")
+    parser.add_argument("--check", action="store_true", help="только проверить, актуален ли пакет")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        pack = AssetPack.open(args.dir)
+        print("актуален" if pack is not None else "отсутствует или устарел")
+        raise SystemExit(0 if pack is not None else 1)
+
+    t0 = time.perf_counter()
+    index = build(args.dir)
+    print(f"Пакет ассетов: {len(index['entries'])} текстур из {len(index['sources'])} файлов, "
+          f"{index['bytes'] / 1024:.0f} KiB, {(time.perf_counter() - t0):.2f} с -> {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# balance.py
+"""
+Пакетный прогон сессий для настройки баланса (spawn_chance, hardness, speed).
+
+Каждая сессия — headless-игра с своим seed, типом кирки и набором
+переопределений параметров из enums.py. Сессии раскладываются по всем ядрам
+(ProcessPoolExecutor), результаты сводятся по (кирка, параметры) в таблицу
+и, по желанию, в CSV.
+
+    python3 -m balance --seeds 20
+    python3 -m balance --pickaxe WOOD IRON NETHERITE --depth 100 \
+        --set block.obsidian.hardness=18,10 --set block.diamond.spawn_chance=0.008,0.02 \
+        --csv runs.csv --summary-csv summary.csv
+"""
+import argparse
+import csv
+import itertools
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from enums import BlockType, PickaxeType
+
+# переопределение: (группа, член enum, поле) -> значение
+Override = Tuple[Tuple[str, str, str], float]
+
+ENUMS = {"block": BlockType, "pickaxe": PickaxeType}
+# исходные значения — чтобы процесс пула, отработав одну сессию, вернул их перед следующей
+_DEFAULTS = {group: {m.name: dict(m.value) for m in enum} for group, enum in ENUMS.items()}
+
+
+def parse_override(spec: str) -> List[Override]:
+    """"block.diamond.spawn_chance=0.008,0.02" -> [(ключ, 0.008), (ключ, 0.02)]."""
+    try:
+        target, values = spec.split("=", 1)
+        group, member, fld = target.split(".")
+    except ValueError:
+        raise ValueError(f"ожидается группа.член.поле=v1,v2: {spec}") from None
+    group, member = group.lower(), member.upper()
+    if group not in ENUMS:
+        raise ValueError(f"неизвестная группа {group!r} (есть: {', '.join(ENUMS)})")
+    if member not in _DEFAULTS[group]:
+        raise ValueError(f"нет {member} в {ENUMS[group].__name__}")
+    if not isinstance(_DEFAULTS[group][member].get(fld), (int, float)):
+        raise ValueError(f"у {group}.{member} нет числового поля {fld!r}")
+    cast = type(_DEFAULTS[group][member][fld])
+    return [((group, member, fld), cast(float(v))) for v in values.split(",") if v]
+
+
+def _apply_overrides(overrides: Sequence[Override]):
+    for group, enum in ENUMS.items():
+        for m in enum:
+            m.value.clear()
+            m.value.update(_DEFAULTS[group][m.name])
+    for (group, member, fld), value in overrides:
+        ENUMS[group][member].value[fld] = value
+
+
+def _label(overrides: Sequence[Override]) -> str:
+    return " ".join(f"{g}.{m.lower()}.{f}={v}" for (g, m, f), v in overrides) or "по умолчанию"
+
+
+# ======= Одна сессия (в процессе пула) =======
+
+def _init_worker():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import simulation  # noqa: F401 — импорт игры настраивает логирование, глушим его после
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def run_session(task: Dict) -> Dict:
+    """Прогоняет одну сессию; task — seed, pickaxe, overrides, ticks, depth."""
+    from settings import SIM_HZ
+    from simulation import HeadlessSimulation
+
+    overrides = task["overrides"]
+    _apply_overrides(overrides)
+    try:
+        sim = HeadlessSimulation(seed=task["seed"])
+        game = sim.game
+        game.apply_command(PickaxeType[task["pickaxe"]].value["command"])
+
+        target = task["depth"]
+        reached_tick: Optional[int] = None
+        start = time.perf_counter()
+        while game.ticks < task["ticks"]:
+            sim.step()
+            if reached_tick is None and target and sim.max_depth >= target:
+                reached_tick = game.ticks
+                if task["stop_at_depth"]:
+                    break
+        wall = time.perf_counter() - start
+    finally:
+        _apply_overrides(())
+
+    minutes = game.ticks / SIM_HZ / 60.0
+    row = {
+        "pickaxe": task["pickaxe"],
+        "params": _label(overrides),
+        "seed": task["seed"],
+        "ticks": game.ticks,
+        "depth": sim.max_depth,
+        "time_to_depth_s": reached_tick / SIM_HZ if reached_tick is not None else "",
+        "blocks_per_s": game.blocks_destroyed / (game.ticks / SIM_HZ) if game.ticks else 0.0,
+        "resources_per_min": sum(game.resources.values()) / minutes if minutes else 0.0,
+        "wall_s": wall,
+    }
+    for name, value in game.resources.items():
+        row[f"{name}_per_min"] = value / minutes if minutes else 0.0
+    return row
+
+
+# ======= Свод =======
+
+def make_tasks(pickaxes: Sequence[str], seeds: Sequence[int], override_axes: Sequence[List[Override]],
+               ticks: int, depth: Optional[int], stop_at_depth: bool) -> List[Dict]:
+    tasks = []
+    for combo in itertools.product(*override_axes) if override_axes else [()]:
+        for pickaxe in pickaxes:
+            for seed in seeds:
+                tasks.append({"seed": seed, "pickaxe": pickaxe, "overrides": list(combo),
+                              "ticks": ticks, "depth": depth, "stop_at_depth": stop_at_depth})
+    return tasks
+
+
+def run_sweep(tasks: List[Dict], workers: Optional[int] = None) -> List[Dict]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        return [run_session(t) for t in tasks]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(run_session, tasks, chunksize=chunksize))
+
+
+def summarize(rows: List[Dict]) -> List[Dict]:
+    """Средние по группам (кирка, параметры); время до глубины — медиана по дошедшим."""
+    groups: Dict[Tuple[str, str], List[Dict]] = {}
+    for r in rows:
+        groups.setdefault((r["params"], r["pickaxe"]), []).append(r)
+    summary = []
+    for (params, pickaxe), runs in groups.items():
+        reached = [r["time_to_depth_s"] for r in runs if r["time_to_depth_s"] != ""]
+        summary.append({
+            "params": params,
+            "pickaxe": pickaxe,
+            "runs": len(runs),
+            "reached": len(reached),
+            "time_to_depth_s": statistics.median(reached) if reached else "",
+            "depth": statistics.mean(r["depth"] for r in runs),
+            "blocks_per_s": statistics.mean(r["blocks_per_s"] for r in runs),
+            "resources_per_min": statistics.mean(r["resources_per_min"] for r in runs),
+        })
+    return summary
+
+
+def write_csv(path: str, rows: List[Dict]):
+    if not rows:
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _fmt(value) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def main(argv=None):
+    from benchmarks.common import format_table
+
+    parser = argparse.ArgumentParser(description="Пакетный прогон сессий для настройки баланса")
+    parser.add_argument("--pickaxe", nargs="+", default=[p.name for p in PickaxeType], metavar="TYPE",
+                        help="типы кирок (по умолчанию все)")
+    parser.add_argument("--seeds", type=int, default=10, help="сессий (seed 0..N-1) на каждую комбинацию")
+    parser.add_argument("--seconds", type=float, default=120.0, help="игровых секунд на сессию")
+    parser.add_argument("--depth", type=int, default=100, help="целевая глубина (строк) для time_to_depth")
+    parser.add_argument("--stop-at-depth", action="store_true", help="заканчивать сессию на целевой глубине")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="G.MEMBER.FIELD=V1,V2",
+                        help="перебрать значения параметра (группа block или pickaxe); можно несколько раз")
+    parser.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию — все ядра)")
+    parser.add_argument("--csv", metavar="PATH", help="все сессии в CSV")
+    parser.add_argument("--summary-csv", metavar="PATH", help="сводную таблицу в CSV")
+    args = parser.parse_args(argv)
+
+    pickaxes = [p.upper() for p in args.pickaxe]
+    unknown = [p for p in pickaxes if p not in PickaxeType.__members__]
+    if unknown:
+        parser.error(f"неизвестные кирки: {', '.join(unknown)}")
+    try:
+        axes = [parse_override(spec) for spec in args.overrides]
+    except ValueError as e:
+        parser.error(str(e))
+
+    from settings import SIM_HZ
+    tasks = make_tasks(pickaxes, range(args.seeds), axes, ticks=int(args.seconds * SIM_HZ),
+                       depth=args.depth, stop_at_depth=args.stop_at_depth)
+    start = time.perf_counter()
+    rows = run_sweep(tasks, args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(rows)
+    headers = ["параметры", "кирка", "сессий", "дошли", f"до глуб. {args.depth}, с",
+               "глубина", "блоков/с", "ресурсов/мин"]
+    print(format_table(headers, [[_fmt(v) for v in s.values()] for s in summary]))
+    print(f"\n{len(rows)} сессий за {elapsed:.1f} с ({args.workers or os.cpu_count()} процессов)")
+
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.summary_csv:
+        write_csv(args.summary_csv, summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/common.py
+import json
+import platform
+import subprocess
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Перцентиль с линейной интерполяцией (pct в диапазоне 0..100)."""
+    if not values:
+        return 0.0
+    data = sorted(values)
+    k = (len(data) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(data) - 1)
+    return data[lo] + (data[hi] - data[lo]) * (k - lo)
+
+
+def summarize_ms(times_s: Sequence[float]) -> Dict[str, float]:
+    """mean/p95/p99/max в миллисекундах по списку времен в секундах."""
+    if not times_s:
+        return {"mean": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": sum(times_s) / len(times_s) * 1000.0,
+        "p95": percentile(times_s, 95) * 1000.0,
+        "p99": percentile(times_s, 99) * 1000.0,
+        "max": max(times_s) * 1000.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def write_report(path: str, kind: str, results: Dict[str, Dict]) -> None:
+    report = {
+        "kind": kind,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def load_report(path: str) -> Dict[str, Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def format_table(headers: List[str], rows: List[List[str]]) -> str:
+    widths = [max(len(str(c)) for c in col) for col in zip(headers, *rows)]
+    lines = ["  ".join(str(h).ljust(w) for h, w in zip(headers, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for row in rows:
+        lines.append("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+    return "\n".join(lines)
+
+
+def delta_pct(new: float, old: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100.0:+.1f}%"
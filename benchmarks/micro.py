@@ -0,0 +1,246 @@
+# benchmarks/micro.py
+"""
+Микробенчмарки горячих путей: создание блока, урон, генерация строк,
+частицы, update() кирки. Для каждого — ops/s и аллокации на операцию
+(по tracemalloc: чистый прирост и пик за пачку операций).
+
+Замечание: пиксельные буферы pygame.Surface выделяет SDL, tracemalloc их
+не видит — в аллокациях учитываются только объекты Python.
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro block_init take_damage --json micro.json
+    python -m benchmarks.micro --compare micro.json
+"""
+import argparse
+import logging
+import math
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+import pygame
+import pymunk
+
+from benchmarks.common import write_report, load_report, format_table, delta_pct
+from block_system import Block, BlockSystem, _try_load_block_images_for_type
+from enums import BlockType
+from particle_system import ParticleSystem
+from pickaxe import Pickaxe
+from settings import BORDER_WIDTH, INITIAL_OFFSET
+
+
+class Bench:
+    """
+    setup() -> state; op(state) — замеряемая операция;
+    reset(state) — уборка между пачками (не замеряется).
+    """
+    def __init__(self, name: str, setup: Callable, op: Callable,
+                 reset: Optional[Callable] = None, batch: int = 200):
+        self.name = name
+        self.setup = setup
+        self.op = op
+        self.reset = reset
+        self.batch = batch
+
+
+# ---- сценарии ----
+
+def _images():
+    return {bt: _try_load_block_images_for_type(bt) for bt in BlockType}
+
+
+def _setup_block_init():
+    return {"space": pymunk.Space(), "images": _images(), "blocks": []}
+
+
+def _op_block_init(st):
+    b = Block(BORDER_WIDTH, INITIAL_OFFSET, BlockType.STONE, st["images"][BlockType.STONE],
+              pm_space=st["space"])
+    st["blocks"].append(b)
+
+
+def _reset_blocks(st):
+    for b in st["blocks"]:
+        b.kill()
+    st["blocks"].clear()
+
+
+def _setup_damage():
+    images = _images()
+    b = Block(BORDER_WIDTH, INITIAL_OFFSET, BlockType.OBSIDIAN, images[BlockType.OBSIDIAN])
+    return {"block": b}
+
+
+def _op_take_damage(st):
+    b = st["block"]
+    if b.health <= 1:
+        b.health = b.max_health
+    b.take_damage(1)
+
+
+def _op_surface_for_health(st):
+    b = st["block"]
+    b.health = b.health - 1 if b.health > 1 else b.max_health
+    b._surface_for_health()
+
+
+def _setup_block_system():
+    return {"bs": BlockSystem(pm_space=pymunk.Space())}
+
+
+def _op_generate_row(st):
+    st["bs"]._generate_row()
+
+
+def _op_materialize_row(st):
+    bs = st["bs"]
+    row = bs.grid.first_row
+    if row in bs._row_views:
+        bs._release_row(row)
+    bs._materialize_row(row)
+
+
+def _op_generate_chunk(st):
+    gen = st["bs"].generator
+    st["chunk"] = st.get("chunk", 0) + 1
+    gen.generate_chunk(st["chunk"])
+
+
+def _setup_particles(count: int = 1500):
+    ps = ParticleSystem(particle_count=count, particle_life=10 ** 9)
+    ps.add_block_break_effect(0, 0, (255, 255, 255))
+    return {"ps": ps}
+
+
+def _op_particles_update(st):
+    st["ps"].update()
+
+
+def _setup_particles_draw():
+    st = _setup_particles()
+    st["surface"] = pygame.Surface((512, 832))
+    return st
+
+
+def _op_particles_draw(st):
+    st["ps"].draw(st["surface"])
+
+
+def _setup_pickaxe():
+    return {"pickaxe": Pickaxe(pymunk.Space()), "angle": 0.0}
+
+
+def _op_pickaxe_update(st):
+    p = st["pickaxe"]
+    # каждый кадр угол немного меняется — как при падении
+    st["angle"] = (st["angle"] + 0.01) % (2 * math.pi)
+    p.body.angle = st["angle"]
+    p.update(0.0)
+
+
+BENCHES: Dict[str, Bench] = {b.name: b for b in [
+    Bench("block_init", _setup_block_init, _op_block_init, _reset_blocks),
+    Bench("take_damage", _setup_damage, _op_take_damage),
+    Bench("surface_for_health", _setup_damage, _op_surface_for_health),
+    Bench("generate_row", _setup_block_system, _op_generate_row, batch=20),
+    Bench("materialize_row", _setup_block_system, _op_materialize_row, batch=20),
+    Bench("generate_chunk", _setup_block_system, _op_generate_chunk, batch=200),
+    Bench("particles_update", _setup_particles, _op_particles_update, batch=50),
+    Bench("particles_draw", _setup_particles_draw, _op_particles_draw, batch=20),
+    Bench("pickaxe_update", _setup_pickaxe, _op_pickaxe_update),
+]}
+
+
+# ---- замеры ----
+
+def measure(bench: Bench, min_time: float = 0.5) -> Dict[str, float]:
+    state = bench.setup()
+
+    # прогрев
+    for _ in range(min(bench.batch, 20)):
+        bench.op(state)
+    if bench.reset:
+        bench.reset(state)
+
+    # скорость
+    ops = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        t0 = time.perf_counter()
+        for _ in range(bench.batch):
+            bench.op(state)
+        elapsed += time.perf_counter() - t0
+        ops += bench.batch
+        if bench.reset:
+            bench.reset(state)
+
+    # аллокации — отдельной пачкой под tracemalloc (он сильно замедляет)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    base_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(bench.batch):
+        bench.op(state)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    net_bytes = sum(d.size_diff for d in diff)
+    net_blocks = sum(d.count_diff for d in diff)
+    if bench.reset:
+        bench.reset(state)
+
+    return {
+        "ops_per_sec": ops / elapsed if elapsed else 0.0,
+        "us_per_op": elapsed / ops * 1e6 if ops else 0.0,
+        "alloc_bytes_per_op": net_bytes / bench.batch,
+        "alloc_blocks_per_op": net_blocks / bench.batch,
+        "peak_kib": (peak - base_current) / 1024.0,
+    }
+
+
+def _print_results(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    headers = ["бенчмарк", "ops/s", "мкс/op", "B/op", "блоков/op", "пик KiB"]
+    if baseline:
+        headers.append("Δops/s")
+    rows = []
+    for name, r in results.items():
+        row = [name, f"{r['ops_per_sec']:.0f}", f"{r['us_per_op']:.2f}",
+               f"{r['alloc_bytes_per_op']:.0f}", f"{r['alloc_blocks_per_op']:.1f}",
+               f"{r['peak_kib']:.1f}"]
+        if baseline:
+            old = baseline.get(name)
+            row.append(delta_pct(r["ops_per_sec"], old["ops_per_sec"]) if old else "n/a")
+        rows.append(row)
+    print(format_table(headers, rows))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Микробенчмарки горячих путей")
+    parser.add_argument("benches", nargs="*", metavar="BENCH",
+                        help=f"какие бенчмарки прогнать: {', '.join(BENCHES)} (по умолчанию все)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="минимум секунд на бенчмарк")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", metavar="PATH", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с сохраненным JSON")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.benches if n not in BENCHES]
+    if unknown:
+        parser.error(f"неизвестные бенчмарки: {', '.join(unknown)}")
+
+    logging.getLogger().setLevel(logging.WARNING)
+    pygame.font.init()
+    results = {}
+    for name in args.benches or list(BENCHES):
+        random.seed(args.seed)
+        results[name] = measure(BENCHES[name], min_time=args.min_time)
+
+    baseline = load_report(args.compare) if args.compare else None
+    _print_results(results, baseline)
+    if args.json:
+        write_report(args.json, "micro", results)
+
+
+if __name__ == "__main__":
+    main()
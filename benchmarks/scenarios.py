@@ -0,0 +1,102 @@
+# benchmarks/scenarios.py
+"""
+Сценарные бенчмарки кадра: реальные Game/BlockSystem/Pickaxe/ParticleSystem
+в фиксированных сценариях с фиксированным seed. Время update() и draw()
+замеряется раздельно (mean/p95/p99/max).
+
+    python -m benchmarks.scenarios
+    python -m benchmarks.scenarios --json bench.json
+    python -m benchmarks.scenarios --compare bench.json   # сравнить с прошлым прогоном
+"""
+import argparse
+import logging
+from typing import Callable, Dict, Optional
+
+from benchmarks.common import (
+    summarize_ms, write_report, load_report, format_table, delta_pct
+)
+from simulation import HeadlessSimulation
+
+
+def _setup_netherite(sim: HeadlessSimulation):
+    sim.game.pickaxe.apply_command("!netherite")
+
+
+def _spawn_diamond_every(period: int) -> Callable[[HeadlessSimulation], None]:
+    def on_frame(sim: HeadlessSimulation):
+        if sim.frames % period == 0:
+            sim.game.apply_command("!spawn diamond")
+    return on_frame
+
+
+# имя -> (кадров, setup, on_frame)
+SCENARIOS: Dict[str, tuple] = {
+    "free_fall": (10000, None, None),
+    "dig_netherite": (5000, _setup_netherite, None),
+    "spawn_diamond": (3000, None, _spawn_diamond_every(30)),
+}
+
+
+def run_scenario(name: str, frames: Optional[int] = None, draw: bool = True,
+                 seed: int = 1234) -> Dict:
+    default_frames, setup, on_frame = SCENARIOS[name]
+    sim = HeadlessSimulation(draw=draw, seed=seed)
+    if setup is not None:
+        setup(sim)
+    stats = sim.run(frames=frames or default_frames, on_frame=on_frame)
+    return {
+        "frames": stats.frames,
+        "update_ms": summarize_ms(stats.update_times),
+        "draw_ms": summarize_ms(stats.draw_times),
+        "blocks_destroyed": stats.blocks_destroyed,
+        "max_depth": stats.max_depth,
+    }
+
+
+def _print_results(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    headers = ["сценарий", "фаза", "mean", "p95", "p99", "max"]
+    if baseline:
+        headers += ["Δmean", "Δp99"]
+    rows = []
+    for name, res in results.items():
+        for phase in ("update_ms", "draw_ms"):
+            s = res[phase]
+            row = [name, phase[:-3], f"{s['mean']:.3f}", f"{s['p95']:.3f}",
+                   f"{s['p99']:.3f}", f"{s['max']:.3f}"]
+            if baseline:
+                old = baseline.get(name, {}).get(phase)
+                row += ([delta_pct(s["mean"], old["mean"]), delta_pct(s["p99"], old["p99"])]
+                        if old else ["n/a", "n/a"])
+            rows.append(row)
+    print(format_table(headers, rows))
+    print("(мс на кадр; бюджет 60 FPS — 16.667 мс на update+draw)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сценарные бенчмарки кадра")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"какие сценарии прогнать: {', '.join(SCENARIOS)} (по умолчанию все)")
+    parser.add_argument("--frames", type=int, default=None, help="переопределить число кадров")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-draw", action="store_true", help="не замерять draw()")
+    parser.add_argument("--json", metavar="PATH", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с сохраненным JSON")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.scenarios if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(unknown)}")
+
+    logging.getLogger().setLevel(logging.WARNING)
+    names = args.scenarios or list(SCENARIOS)
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, frames=args.frames, draw=not args.no_draw, seed=args.seed)
+
+    baseline = load_report(args.compare) if args.compare else None
+    _print_results(results, baseline)
+    if args.json:
+        write_report(args.json, "scenarios", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,25 +3,37 @@ import random
 import pygame
 import pymunk
 import logging
-from typing import Dict, Optional
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from asset_manager import LazyMapping, assets
 from enums import BlockType
+from gfx import prepare_surface
 from settings import (
-    BLOCK_SIZE, BORDER_WIDTH, SCREEN_HEIGHT, GRID_COLS,
-    INITIAL_SPAWN_ROWS, INITIAL_OFFSET, BLOCK_HP_PER_HARDNESS,
-    BLOCK_HP_THRESHOLDS, BLOCKS_DIR
+    BLOCK_SIZE, BORDER_WIDTH, SCREEN_HEIGHT,
+    INITIAL_SPAWN_ROWS, BLOCK_HP_PER_HARDNESS,
+    BLOCK_HP_THRESHOLDS, BLOCKS_DIR, VIEW_MARGIN_ROWS, PHYSICS_ACTIVE_ROWS,
+    ROW_RETENTION_ABOVE, RENDER_CHUNK_ROWS, ASSET_LAZY_SPAWN_CHANCE
 )
+from world_gen import WorldGenerator
+from world_grid import WorldGrid, TYPE_IDS, type_of, row_at, row_world_y
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def _safe_load(path: str, size=(BLOCK_SIZE, BLOCK_SIZE)) -> Optional[pygame.Surface]:
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.smoothscale(img, size)
-    except Exception:
-        logger.warning(f"Failed to load image at {path}")
-        return None
+    # общая (дедуплицированная) текстура из AssetManager; None — файла нет
+    return assets.image(path, size)
+
+
+def _block_image_paths(bt: BlockType) -> List[str]:
+    """Все файлы, которые может прочитать _try_load_block_images_for_type (для preload)."""
+    folder_type = os.path.join(BLOCKS_DIR, bt.name.lower())
+    paths = [os.path.join(folder_type, f"{bt.name.lower()}.png")]
+    for thr in BLOCK_HP_THRESHOLDS:
+        paths.append(os.path.join(folder_type, f"block_{thr}.png"))
+        paths.append(os.path.join(BLOCKS_DIR, f"block_{thr}.png"))
+    return paths
 
 
 def _try_load_block_images_for_type(bt: BlockType) -> Dict[str, Optional[pygame.Surface]]:
@@ -56,48 +68,156 @@ def _try_load_block_images_for_type(bt: BlockType) -> Dict[str, Optional[pygame.
     return {"base": None}
 
 
+# Пороги по убыванию — для выбора стадии повреждения
+_THRESHOLDS_DESC = tuple(sorted(BLOCK_HP_THRESHOLDS, reverse=True))
+
+# Общий на процесс кэш готовых стадий: (тип, порог HP) -> (поверхность, маска).
+# Картинка стадии зависит только от типа и порога, поэтому блоки ссылаются
+# на общие поверхности/маски вместо того, чтобы собирать свои.
+_STAGE_CACHE: Dict[Tuple[BlockType, int], Tuple[pygame.Surface, pygame.mask.Mask]] = {}
+
+
+def threshold_for(health: int, max_health: int) -> int:
+    """Порог стадии повреждения для HP."""
+    p = (health / max_health) * 100.0
+    for thr in _THRESHOLDS_DESC:
+        if p >= thr:
+            return thr
+    return _THRESHOLDS_DESC[-1]
+
+
+def _span_minus(a: Tuple[int, int], b: Tuple[int, int]) -> List[int]:
+    """Строки диапазона a = [lo, hi), не входящие в диапазон b."""
+    lo, hi = a
+    return [r for r in range(lo, min(hi, b[0]))] + [r for r in range(max(lo, b[1]), hi)]
+
+
+def _compose_stage(bt: BlockType, thr: int,
+                   images_by_thr: Optional[Dict[str, Optional[pygame.Surface]]]) -> pygame.Surface:
+    """Собирает стадию: база (или заливка цветом) + текстура повреждения (или трещины)."""
+    images_by_thr = images_by_thr or {}
+    s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+
+    # База
+    if images_by_thr.get("base"):
+        s.blit(images_by_thr["base"], (0, 0))
+    else:
+        pygame.draw.rect(s, bt.value["color"], (0, 0, BLOCK_SIZE, BLOCK_SIZE))
+
+    # Повреждения
+    if thr < 100:
+        if images_by_thr.get(thr):
+            s.blit(images_by_thr[thr], (0, 0))
+        else:
+            # fallback — трещины, по одной на каждые 20% потерянного HP
+            dmg = (100 - thr) // 20
+            crack = (0, 0, 0, 60)
+            for i in range(dmg):
+                pygame.draw.line(s, crack, (8, 10 + i*10), (BLOCK_SIZE-8, 16 + i*12), 2)
+
+    return prepare_surface(s)
+
+
+def stage_for(bt: BlockType, thr: int,
+              images_by_thr: Optional[Dict[str, Optional[pygame.Surface]]]
+              ) -> Tuple[pygame.Surface, pygame.mask.Mask]:
+    """Поверхность и маска стадии (тип, порог) из общего кэша; собирается один раз."""
+    key = (bt, thr)
+    stage = _STAGE_CACHE.get(key)
+    if stage is None:
+        surf = _compose_stage(bt, thr, images_by_thr)
+        stage = (surf, pygame.mask.from_surface(surf))
+        _STAGE_CACHE[key] = stage
+    return stage
+
+
+def build_stage_cache(type_to_images: Dict[BlockType, Dict[str, Optional[pygame.Surface]]]) -> None:
+    """Заранее собирает все стадии для всех типов."""
+    for bt, images in type_to_images.items():
+        for thr in _THRESHOLDS_DESC:
+            stage_for(bt, thr, images)
+
+
+def clear_stage_cache() -> None:
+    """Сбрасывает кэш стадий (например, после перезагрузки текстур)."""
+    _STAGE_CACHE.clear()
+
+
 class Block(pygame.sprite.Sprite):
-    """Спрайт блока с HP и сменой спрайта по порогам HP."""
+    """
+    Спрайт блока с HP и сменой спрайта по порогам HP.
+    Если задана клетка сетки (grid, row, col), блок — лишь ее представление:
+    HP и тип пишутся обратно в WorldGrid.
+    """
     # Статический счетчик для генерации уникальных ID
     _next_id = 0
 
     def __init__(self, world_x: int, world_y: int, btype: BlockType,
                  images_by_thr: Dict[str, Optional[pygame.Surface]],
-                 pm_space: Optional[pymunk.Space] = None):
+                 pm_space: Optional[pymunk.Space] = None,
+                 health: Optional[int] = None,
+                 grid: Optional[WorldGrid] = None, row: int = -1, col: int = -1):
         super().__init__()
-        # Генерируем уникальный ID для блока
-        self.id = Block._next_id
-        Block._next_id += 1
+        self.grid = grid
+        self.row = row
+        self.col = col
+        if grid is not None:
+            # ID клетки стабилен — спрайт можно пересоздать, не теряя контакт
+            self.id = row * grid.cols + col
+        else:
+            # Генерируем уникальный ID для блока
+            self.id = Block._next_id
+            Block._next_id += 1
 
         self.type = btype
         self.color = btype.value["color"]
         self.max_health = max(1, btype.value["hardness"] * BLOCK_HP_PER_HARDNESS)
-        self.health = self.max_health
+        self.health = self.max_health if health is None else health
         self.world_x = world_x
         self.world_y = world_y
         self.images_by_thr = images_by_thr
 
-        self.image = self._surface_for_health()
+        self._thr = self._pick_thr()
+        self.image, self.mask = stage_for(self.type, self._thr, self.images_by_thr)
         self.rect = self.image.get_rect(topleft=(world_x, world_y))
-        self.mask = pygame.mask.from_surface(self.image)
 
-        self.pm_space = pm_space
+        self.pm_space: Optional[pymunk.Space] = None
         self.pm_body: Optional[pymunk.Body] = None
         self.pm_shape: Optional[pymunk.Shape] = None
 
-        if self.pm_space is not None:
-            self.pm_body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
-            # Используем мировые координаты вместо экранных для корректной физики
-            self.pm_body.position = (self.world_x + BLOCK_SIZE // 2, self.world_y + BLOCK_SIZE // 2)
+        if pm_space is not None:
+            pm_space.add(self.attach_physics(pm_space))
+
+    # ======= Физика =======
 
-            self.pm_shape = pymunk.Poly.create_box(self.pm_body, (BLOCK_SIZE, BLOCK_SIZE))
-            self.pm_shape.elasticity = 0.2  # увеличиваем упругость
-            self.pm_shape.friction = 0.3  # уменьшаем трение
-            self.pm_shape.filter = pymunk.ShapeFilter(group=2)  # блоки не сталкиваются между собой
-            self.pm_shape.block_ref = self
-            self.pm_shape.collision_type = 2
-            self.pm_space.add(self.pm_body, self.pm_shape)
-            print(f"Создан блок {self.id} с физикой на позиции {self.pm_body.position}")  # отладка
+    def attach_physics(self, space: pymunk.Space) -> pymunk.Shape:
+        """
+        Создает статическую форму блока на space.static_body (в мировых координатах).
+        В пространство форму добавляет вызывающий — так BlockSystem добавляет
+        формы пачкой за один space.add().
+        """
+        x0, y0 = self.world_x, self.world_y
+        x1, y1 = x0 + BLOCK_SIZE, y0 + BLOCK_SIZE
+        shape = pymunk.Poly(space.static_body, [(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+        shape.elasticity = 0.2  # увеличиваем упругость
+        shape.friction = 0.3  # уменьшаем трение
+        shape.filter = pymunk.ShapeFilter(group=2)  # блоки не сталкиваются между собой
+        shape.block_ref = self
+        shape.collision_type = 2
+
+        self.pm_space = space
+        self.pm_body = space.static_body
+        self.pm_shape = shape
+        logger.debug("Блок %s получил физику на позиции (%s, %s)", self.id, x0, y0)
+        return shape
+
+    def detach_physics(self) -> Optional[pymunk.Shape]:
+        """Отвязывает форму от блока; убрать ее из space — задача вызывающего."""
+        shape = self.pm_shape
+        self.pm_space = None
+        self.pm_body = None
+        self.pm_shape = None
+        return shape
 
     # ======= Вспомогательные =======
 
@@ -105,53 +225,51 @@ class Block(pygame.sprite.Sprite):
         return (self.health / self.max_health) * 100.0
 
     def _pick_thr(self) -> int:
-        p = self._percent()
-        for thr in sorted(BLOCK_HP_THRESHOLDS, reverse=True):
-            if p >= thr:
-                return thr
-        return min(BLOCK_HP_THRESHOLDS)
+        return threshold_for(self.health, self.max_health)
 
     def _surface_for_health(self) -> pygame.Surface:
-        thr = self._pick_thr()
-        s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-
-        # База
-        if self.images_by_thr.get("base"):
-            s.blit(self.images_by_thr["base"], (0, 0))
-        else:
-            pygame.draw.rect(s, self.color, (0, 0, BLOCK_SIZE, BLOCK_SIZE))
-
-        # Повреждения
-        if thr < 100:
-            if self.images_by_thr.get(thr):
-                s.blit(self.images_by_thr[thr], (0, 0))
-            else:
-                # fallback — трещины
-                dmg = int((100 - self._percent()) // 20)
-                crack = (0, 0, 0, 60)
-                for i in range(dmg):
-                    pygame.draw.line(s, crack, (8, 10 + i*10), (BLOCK_SIZE-8, 16 + i*12), 2)
+        """Общая (кэшированная) поверхность для текущего HP. Не изменять!"""
+        return stage_for(self.type, self._pick_thr(), self.images_by_thr)[0]
 
-        return s
+    def _refresh_stage(self, force: bool = False) -> None:
+        """Переключает image/mask на общую стадию, если порог HP сменился."""
+        thr = self._pick_thr()
+        if force or thr != self._thr:
+            self._thr = thr
+            self.image, self.mask = stage_for(self.type, thr, self.images_by_thr)
+            if self.grid is not None:
+                self.grid.mark_dirty(self.row)
+
+    def retype(self, btype: BlockType, images_by_thr: Dict[str, Optional[pygame.Surface]]) -> None:
+        """Меняет тип блока с полным восстановлением HP."""
+        self.type = btype
+        self.color = btype.value["color"]
+        self.max_health = max(1, btype.value["hardness"] * BLOCK_HP_PER_HARDNESS)
+        self.health = self.max_health
+        self.images_by_thr = images_by_thr
+        if self.grid is not None:
+            self.grid.set_type(self.row, self.col, TYPE_IDS[btype])
+        self._refresh_stage(force=True)
 
     # ======= Жизненный цикл =======
 
     def take_damage(self, amount: int) -> bool:
         self.health -= max(1, amount)
+        if self.grid is not None:
+            self.grid.set_hp(self.row, self.col, self.health)
 
         if self.health <= 0:
             self.kill()
             return True
 
-        self.image = self._surface_for_health()
-        self.mask = pygame.mask.from_surface(self.image)
+        self._refresh_stage()
         return False
 
     def kill(self) -> None:
-        if self.pm_space and self.pm_body and self.pm_shape:
-            self.pm_space.remove(self.pm_body, self.pm_shape)
-            self.pm_body = None
-            self.pm_shape = None
+        space = self.pm_space
+        shape = self.detach_physics()
+        if space is not None and shape is not None:
+            space.remove(shape)
         super().kill()
 
     def sync_screen_pos(self, scroll_y: float):
@@ -160,89 +278,386 @@ class Block(pygame.sprite.Sprite):
         """
         self.rect.x = self.world_x
         self.rect.y = int(self.world_y - scroll_y)
-        # Убираем принудительное обновление позиции физического тела
-        # для кинематических тел это может вызвать проблемы с коллизиями
-        # if self.pm_body is not None:
-        #     self.pm_body.position = (self.rect.centerx, self.rect.centery)
+        # Физическая форма статична и живет в мировых координатах — не трогаем
 
 
 class BlockSystem:
-    """Генерация и скролл блоков на базе спрайтов."""
-    def __init__(self, pm_space: Optional[pymunk.Space] = None):
+    """
+    Генерация и скролл блоков. Мир хранится в WorldGrid (тип + HP на клетку);
+    спрайты Block существуют только для строк у экрана и у кирки, а физические
+    формы — только в полосе PHYSICS_ACTIVE_ROWS вокруг кирки. Строки, ушедшие
+    выше камеры дальше чем на retention_rows, выбрасываются из сетки.
+    """
+    def __init__(self, pm_space: Optional[pymunk.Space] = None,
+                 retention_rows: int = ROW_RETENTION_ABOVE, rng: Optional[random.Random] = None,
+                 grid: Optional[WorldGrid] = None, scroll_y: float = 0.0,
+                 focus_y: Optional[float] = None, scheduler=None,
+                 on_redraw: Optional[Callable[[pygame.Rect], None]] = None):
+        """
+        grid — готовый мир (из снимка) вместо генерации начальных строк;
+        scheduler (FrameScheduler) — куда откладывать тяжелую не срочную работу;
+        on_redraw — получает мировой прямоугольник, картинка которого сменилась
+        в отложенной работе (для dirty-rect режима).
+        """
         self.pm_space = pm_space
-        self.scroll_y = 0.0
+        self.scheduler = scheduler
+        self.on_redraw = on_redraw
+        self.retention_rows = retention_rows
+        # генерация мира и чат-команды используют только свой генератор
+        # (Game передает засеянный); без него — засеянный из random
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        # типы клеток — чанками по seed (тот же seed -> тот же мир, и после снимка)
+        self.generator = WorldGenerator(self.rng.getrandbits(64))
+        self.scroll_y = scroll_y
+        self.focus_y: Optional[float] = focus_y  # мировая Y кирки
+        restored = grid is not None
+        self.grid = grid if restored else WorldGrid()
         self.block_sprites = pygame.sprite.Group()
-
-        # Картинки по типам
-        self.type_to_images: Dict[BlockType, Dict[str, Optional[pygame.Surface]]] = {
-            bt: _try_load_block_images_for_type(bt) for bt in BlockType
-        }
-
-        self._generate_initial_rows()
+        # Индекс строк: строка -> {колонка: спрайт} для материализованных строк.
+        # Материализованные строки и строки с физикой — непрерывные диапазоны
+        # [lo, hi), поэтому за кадр трогаются только строки на их краях.
+        self._row_views: Dict[int, Dict[int, Block]] = {}
+        self._view_span: Tuple[int, int] = (0, 0)
+        self._physics_span: Tuple[int, int] = (0, 0)
+        # кэш отрисовки: чанк из RENDER_CHUNK_ROWS строк -> готовая полоса
+        self._strips: Dict[int, pygame.Surface] = {}
+        self.strip_renders = 0
+        # строки, где тип клеток в сетке сменился, а спрайты еще старые
+        # (обновляются планировщиком или синхронно — перед подключением физики)
+        self._stale_views: Set[int] = set()
+        # полосы, которые показывают устаревшую картинку и ждут перерисовки в планировщике
+        self._stale_strips: Set[int] = set()
+
+        # Картинки по типам: частые типы декодируются сразу (параллельно),
+        # редкие (spawn_chance < ASSET_LAZY_SPAWN_CHANCE) — при первом обращении
+        eager = [bt for bt in BlockType if bt.value["spawn_chance"] >= ASSET_LAZY_SPAWN_CHANCE]
+        assets.preload(p for bt in eager for p in _block_image_paths(bt))
+        self.type_to_images: LazyMapping = LazyMapping(
+            {bt: partial(_try_load_block_images_for_type, bt) for bt in BlockType}, eager=eager)
+
+        build_stage_cache(self.type_to_images.loaded())
+        if scheduler is not None:
+            # редкие типы — догрузить и собрать их стадии заранее, по кусочку за кадр
+            scheduler.add(self._warm_lazy_types(), "warm_lazy_types")
+
+        if not restored:
+            self._generate_initial_rows()
+        self._sync_views()
+        self._sync_physics()
         logger.info("BlockSystem: initialized")
 
     # ======= Генерация =======
 
-    def _random_block_type(self) -> BlockType:
-        types = [bt for bt in BlockType]
-        weights = [bt.value["spawn_chance"] for bt in BlockType]
-        total = sum(weights) or 1.0
-        return random.choices(types, weights=weights, k=1)[0]
-
-    def _generate_row(self, world_y: int):
-        for col in range(GRID_COLS):
-            world_x = col * BLOCK_SIZE + BORDER_WIDTH
-            bt = self._random_block_type()
-            images = self.type_to_images.get(bt)
-            b = Block(world_x, world_y, bt, images, pm_space=self.pm_space)
-            b.sync_screen_pos(self.scroll_y)
-            self.block_sprites.add(b)
+    def _generate_row(self) -> int:
+        """Дописывает в сетку следующую строку; возвращает ее индекс."""
+        return self.grid.append_row(self.generator.row(self.grid.end_row))
 
     def _generate_initial_rows(self):
-        for i in range(INITIAL_SPAWN_ROWS):
-            self._generate_row(INITIAL_OFFSET + i * BLOCK_SIZE)
+        for _ in range(INITIAL_SPAWN_ROWS):
+            self._generate_row()
+
+    # ======= Спрайты-представления =======
+
+    def _view_range(self) -> Tuple[int, int]:
+        """Строки [lo, hi), для которых нужны спрайты: экран и кирка ± запас."""
+        lo = row_at(self.scroll_y) - VIEW_MARGIN_ROWS
+        hi = row_at(self.scroll_y + SCREEN_HEIGHT) + 1 + VIEW_MARGIN_ROWS
+        if self.focus_y is not None:
+            margin = max(VIEW_MARGIN_ROWS, PHYSICS_ACTIVE_ROWS)
+            focus_row = row_at(self.focus_y)
+            lo = min(lo, focus_row - margin)
+            hi = max(hi, focus_row + 1 + margin)
+        return max(lo, self.grid.first_row), hi
+
+    def _physics_range(self) -> Tuple[int, int]:
+        """Строки [lo, hi) с активной физикой; без кирки — все материализованные."""
+        if self.focus_y is None:
+            return self._view_range()
+        focus_row = row_at(self.focus_y)
+        return focus_row - PHYSICS_ACTIVE_ROWS, focus_row + 1 + PHYSICS_ACTIVE_ROWS
+
+    def _materialize_row(self, row: int):
+        world_y = row_world_y(row)
+        types = self.grid.row_types(row)
+        hps = self.grid.row_hp(row)
+        views: Dict[int, Block] = {}
+        for col in range(self.grid.cols):
+            hp = int(hps[col])
+            if hp <= 0:
+                continue
+            bt = type_of(int(types[col]))
+            b = Block(col * BLOCK_SIZE + BORDER_WIDTH, world_y, bt, self.type_to_images.get(bt),
+                      health=hp, grid=self.grid, row=row, col=col)
+            b.sync_screen_pos(self.scroll_y)
+            views[col] = b
+        self.block_sprites.add(*views.values())
+        self._row_views[row] = views
+
+    def _release_row(self, row: int):
+        # HP уже в сетке — спрайты и формы просто удаляются
+        self._stale_views.discard(row)
+        views = self._row_views.pop(row, None)
+        if views:
+            for b in views.values():
+                b.kill()
+
+    def _sync_views(self):
+        span = self._view_range()
+        while self.grid.end_row < span[1]:
+            self._generate_row()
+        for row in _span_minus(self._view_span, span):
+            self._release_row(row)
+        for row in _span_minus(span, self._view_span):
+            self._materialize_row(row)
+        self._view_span = span
+
+    def _sync_physics(self):
+        """
+        Статические формы добавляются/убираются пачкой (один space.add/remove
+        на кадр), поэтому space.step платит только за полосу вокруг кирки,
+        а не за все сгенерированные строки.
+        """
+        if self.pm_space is None:
+            return
+        span = self._physics_range()
+        removed: List[pymunk.Shape] = []
+        for row in _span_minus(self._physics_span, span):
+            for b in self._row_views.get(row, {}).values():
+                shape = b.detach_physics()
+                if shape is not None:
+                    removed.append(shape)
+        added: List[pymunk.Shape] = []
+        for row in _span_minus(span, self._physics_span):
+            if row in self._stale_views:
+                self._resync_row_views(row)
+            for b in self._row_views.get(row, {}).values():
+                if b.alive() and b.pm_shape is None:
+                    added.append(b.attach_physics(self.pm_space))
+        self._physics_span = span
+        if removed:
+            self.pm_space.remove(*removed)
+        if added:
+            self.pm_space.add(*added)
 
     # ======= Обновление =======
 
-    def _remove_offscreen(self):
-        for b in list(self.block_sprites):
-            if b.rect.top > SCREEN_HEIGHT + BLOCK_SIZE:
-                b.kill()
+    def _evict_rows(self):
+        """
+        Выбрасывает строки, ушедшие выше камеры (и кирки) дальше чем на
+        retention_rows: их спрайты, формы и данные в сетке. Камера едет вниз,
+        поэтому память и число тел остаются постоянными на любой глубине.
+        """
+        top_row = row_at(self.scroll_y)
+        if self.focus_y is not None:
+            top_row = min(top_row, row_at(self.focus_y))
+        # строки со спрайтами не выбрасываем, даже если retention_rows мал
+        cutoff = min(top_row - self.retention_rows, self._view_span[0])
+        if cutoff <= self.grid.first_row:
+            return
+        dropped = self.grid.drop_rows_before(cutoff)
+        logger.debug("BlockSystem: выброшено строк: %s (первая строка теперь %s)", dropped, self.grid.first_row)
 
     def _generate_new_if_needed(self):
-        if not self.block_sprites:
-            self._generate_row(self.scroll_y + INITIAL_OFFSET)
-            return
-        last_y = max((b.world_y for b in self.block_sprites), default=self.scroll_y + INITIAL_OFFSET)
+        last_y = row_world_y(self.grid.end_row - 1)
         if (last_y - self.scroll_y) < SCREEN_HEIGHT:
-            self._generate_row(last_y + BLOCK_SIZE)
+            self._generate_row()
 
     def scroll(self, amount: float):
         self.scroll_y += amount
-        for b in self.block_sprites:
-            b.sync_screen_pos(self.scroll_y)
 
-    def update(self, scroll_y):
+    def update(self, scroll_y, focus_y: Optional[float] = None):
         self.scroll_y = scroll_y
-        
-        # синхронизация экранных координат всех блоков
-        for b in self.block_sprites:
-            b.sync_screen_pos(scroll_y)
-        
-        # проверяем, нужно ли добавить новые строки
+        self.focus_y = focus_y
+
+        # проверяем, нужно ли добавить новые строки и выбросить старые
         self._generate_new_if_needed()
-    
-    def draw(self, surface: pygame.Surface):
-        self.block_sprites.draw(surface)
+        self._evict_rows()
+
+        # спрайты только для строк у экрана/кирки, физика — только у кирки.
+        # Экранные координаты считаются в draw() и только для видимых строк.
+        self._sync_views()
+        self._sync_physics()
+        if self._stale_views:
+            # строки, доехавшие до экрана раньше планировщика, — сразу (иначе подписи HP устарели)
+            for row in self._screen_rows():
+                if row in self._stale_views:
+                    self._resync_row_views(row)
+
+        # грязные строки нужны только для сброса кэшированных полос; пока ничего
+        # не рисуется (headless), полос нет — и копить строки незачем
+        if not self._strips:
+            self.grid.dirty_rows.clear()
+
+    def visible_rows(self, scroll_y: Optional[float] = None) -> range:
+        """Строки, пересекающие экран (scroll_y — камера отрисовки, по умолчанию текущая)."""
+        if scroll_y is None:
+            scroll_y = self.scroll_y
+        lo = max(row_at(scroll_y), self._view_span[0])
+        hi = min(row_at(scroll_y + SCREEN_HEIGHT - 1) + 1, self._view_span[1])
+        return range(lo, hi)
+
+    def visible_blocks(self, scroll_y: Optional[float] = None) -> Iterator[Block]:
+        """Живые блоки на экране (rect синхронизирован с камерой отрисовки)."""
+        if scroll_y is None:
+            scroll_y = self.scroll_y
+        for row in self.visible_rows(scroll_y):
+            for b in self._row_views.get(row, {}).values():
+                if b.health > 0:
+                    b.sync_screen_pos(scroll_y)
+                    yield b
+
+    # ======= Отрисовка =======
+
+    def _render_strip(self, chunk: int) -> pygame.Surface:
+        """Рисует полосу из RENDER_CHUNK_ROWS строк прямо по данным сетки."""
+        strip = self._strips.get(chunk)
+        if strip is None:
+            strip = prepare_surface(pygame.Surface(
+                (self.grid.cols * BLOCK_SIZE, RENDER_CHUNK_ROWS * BLOCK_SIZE), pygame.SRCALPHA))
+            self._strips[chunk] = strip
+        strip.fill((0, 0, 0, 0))
+        max_hp = self.grid.max_hp
+        first = chunk * RENDER_CHUNK_ROWS
+        batch = []
+        for row in range(max(first, self.grid.first_row), min(first + RENDER_CHUNK_ROWS, self.grid.end_row)):
+            types = self.grid.row_types(row).tolist()
+            hps = self.grid.row_hp(row).tolist()
+            y = (row - first) * BLOCK_SIZE
+            for col, (tid, hp) in enumerate(zip(types, hps)):
+                if hp <= 0:
+                    continue
+                bt = type_of(tid)
+                surf = stage_for(bt, threshold_for(hp, int(max_hp[tid])), self.type_to_images.get(bt))[0]
+                batch.append((surf, (col * BLOCK_SIZE, y)))
+        strip.blits(batch, doreturn=False)
+        self.strip_renders += 1
+        return strip
+
+    def draw(self, surface: pygame.Surface, scroll_y: Optional[float] = None):
+        """
+        Мир рисуется кэшированными полосами: полоса перерисовывается, только
+        если в ее строках блок сменил стадию, тип или был разрушен.
+        scroll_y — камера отрисовки (интерполированная), по умолчанию текущая.
+        """
+        if scroll_y is None:
+            scroll_y = self.scroll_y
+        self._invalidate_strips(self.grid.pop_dirty_rows())
+
+        rows = range(row_at(scroll_y), row_at(scroll_y + SCREEN_HEIGHT - 1) + 1)
+        first_chunk = rows.start // RENDER_CHUNK_ROWS
+        last_chunk = (rows.stop - 1) // RENDER_CHUNK_ROWS
+        batch = []
+        for chunk in range(first_chunk, last_chunk + 1):
+            strip = self._strips.get(chunk)
+            if strip is None:
+                strip = self._render_strip(chunk)
+            batch.append((strip, (BORDER_WIDTH, int(row_world_y(chunk * RENDER_CHUNK_ROWS) - scroll_y))))
+        surface.blits(batch, doreturn=False)
+
+        # полосы, ушедшие с экрана, не держим
+        for chunk in [c for c in self._strips if c < first_chunk - 1 or c > last_chunk + 1]:
+            del self._strips[chunk]
+            self._stale_strips.discard(chunk)
+
+    def _invalidate_strips(self, rows: Set[int]):
+        """
+        Обычно меняется одна-две полосы (удар по блоку) — их сбрасываем сразу.
+        Если полос много (чат-команда перекрасила мир), одна перерисовывается
+        в этом кадре, остальные еще кадр-другой показывают старую картинку
+        и перерисовываются планировщиком в пределах бюджета.
+        """
+        chunks = sorted({row // RENDER_CHUNK_ROWS for row in rows})
+        if self.scheduler is None or len(chunks) <= 2:
+            for chunk in chunks:
+                self._strips.pop(chunk, None)
+                self._stale_strips.discard(chunk)
+            return
+        self._strips.pop(chunks[0], None)
+        self._stale_strips.discard(chunks[0])
+        # полос, которых нет в кэше, это не касается — они нарисуются при показе
+        fresh = [c for c in chunks[1:] if c in self._strips and c not in self._stale_strips]
+        self._stale_strips.update(fresh)
+        if fresh:
+            self.scheduler.add(self._rerender_job(fresh), "rerender_strips")
+
+    def _rerender_job(self, chunks: List[int]) -> Iterator[None]:
+        for chunk in chunks:
+            if chunk in self._stale_strips:
+                self._stale_strips.discard(chunk)
+                if chunk in self._strips:
+                    self._render_strip(chunk)
+                    self._redrawn(chunk * RENDER_CHUNK_ROWS, RENDER_CHUNK_ROWS)
+                yield
     # ======= Чат-команды =======
 
     def apply_chat_command(self, command: str):
         if command.lower() == "!spawn diamond":
-            for b in self.block_sprites:
-                if random.random() < 0.1:
-                    b.type = BlockType.DIAMOND
-                    b.color = b.type.value["color"]
-                    b.max_health = max(1, b.type.value["hardness"] * BLOCK_HP_PER_HARDNESS)
-                    b.health = b.max_health
-                    b.images_by_thr = self.type_to_images.get(BlockType.DIAMOND)
-                    b.image = b._surface_for_health()
+            # Сетка меняется сразу (дешево и детерминированно). Спрайты строк с
+            # физикой перекрашиваются тоже сразу, остальные — отложенно.
+            diamond_id = TYPE_IDS[BlockType.DIAMOND]
+            changed = []
+            for row in range(self.grid.first_row, self.grid.end_row):
+                hps = self.grid.row_hp(row)
+                row_changed = False
+                for col in range(self.grid.cols):
+                    if hps[col] <= 0 or self.rng.random() >= 0.1:
+                        continue
+                    self.grid.set_type(row, col, diamond_id)
+                    row_changed = True
+                if row_changed and row in self._row_views:
+                    changed.append(row)
+            self._retype_views(changed)
+
+    # ======= Отложенная работа =======
+
+    def _screen_rows(self) -> range:
+        """Строки на экране с запасом в строку (камера отрисовки интерполируется)."""
+        return range(row_at(self.scroll_y) - 1, row_at(self.scroll_y + SCREEN_HEIGHT - 1) + 2)
+
+    def _redrawn(self, first_row: int, rows: int):
+        if self.on_redraw is not None:
+            self.on_redraw(pygame.Rect(BORDER_WIDTH, int(row_world_y(first_row)),
+                                       self.grid.cols * BLOCK_SIZE, rows * BLOCK_SIZE))
+
+    def _resync_row_views(self, row: int):
+        """Приводит тип/HP спрайтов строки к сетке."""
+        self._stale_views.discard(row)
+        views = self._row_views.get(row)
+        if not views:
+            return
+        types = self.grid.row_types(row)
+        changed = False
+        for col, b in views.items():
+            bt = type_of(int(types[col]))
+            if bt is not None and bt is not b.type:
+                b.retype(bt, self.type_to_images[bt])
+                changed = True
+        if changed:
+            self._redrawn(row, 1)
+
+    def _retype_views(self, rows: List[int]):
+        lo, hi = self._physics_span
+        screen = self._screen_rows()
+        deferred = []
+        for row in rows:
+            if self.scheduler is None or lo <= row < hi or row in screen:
+                self._resync_row_views(row)
+            else:
+                deferred.append(row)
+        if deferred:
+            self._stale_views.update(deferred)
+            self.scheduler.add(self._resync_job(deferred), "resync_views")
+
+    def _resync_job(self, rows: List[int]) -> Iterator[None]:
+        for row in rows:
+            if row in self._stale_views:
+                self._resync_row_views(row)
+                yield
+
+    def _warm_lazy_types(self) -> Iterator[None]:
+        for bt in BlockType:
+            images = self.type_to_images[bt]  # ленивые типы грузятся здесь
+            yield
+            for thr in _THRESHOLDS_DESC:
+                stage_for(bt, thr, images)
+            yield
@@ -1,36 +1,110 @@
+import logging
+from time import perf_counter
+from typing import Optional
 import pygame
 from block_system import BlockSystem
 from pickaxe import Pickaxe
 from particle_system import ParticleSystem
+from perf_overlay import FrameProfiler, PerfOverlay
+from quality import QualityController
+from scheduler import FrameScheduler
 from settings import *
 from enums import PickaxeType, BlockType
 import random
 import pymunk
 import pymunk.pygame_util
+from asset_manager import assets
+from gfx import prepare_surface
+from hud import BlockLabels, Hud, TextCache
+
+logger = logging.getLogger(__name__)
+
+# клавиши -> команды; клавиатура и чат идут через Game.apply_command
+KEY_COMMANDS = {
+    pygame.K_LEFT: "!left",
+    pygame.K_RIGHT: "!right",
+    pygame.K_SPACE: "!activate",
+    pygame.K_1: "!wood",
+    pygame.K_2: "!stone",
+    pygame.K_3: "!iron",
+    pygame.K_4: "!gold",
+    pygame.K_5: "!diamond",
+    pygame.K_6: "!netherite",
+    pygame.K_l: "!large",
+    pygame.K_s: "!small",
+    pygame.K_d: "!spawn diamond",
+}
+# не команда: переключает оверлей производительности (perf_overlay.py)
+PERF_OVERLAY_KEY = pygame.K_F3
 
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen: pygame.Surface = None, dirty_rects: bool = DIRTY_RECTS,
+                 seed: Optional[int] = None, snapshot=None):
+        # screen=None — headless-режим: окна нет, рисуем (если нужно) во внеэкранную поверхность
+        if screen is None:
+            screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # snapshot (snapshot.Snapshot) — продолжить сохраненную игру вместо нового мира
+        if snapshot is not None and seed is None:
+            seed = snapshot.seed
+        # Вся случайность игры — из одного seed: у мира, частиц и столкновений
+        # свои генераторы, чтобы, например, число частиц не сдвигало генерацию мира
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        world_rng = random.Random(self.rng.getrandbits(64))
+        particles_seed = self.rng.getrandbits(64)
+        # InputRecorder (replay.py), если сессия записывается
+        self.recorder = None
         self.space = pymunk.Space()
         self.space.gravity = (0, 400)  # еще больше уменьшаем гравитацию для лучшего контакта с блоками
-        self._physics_dt = 1.0 / 60.0
+        # фиксированный тик логики: update() — ровно один тик, advance(dt) — сколько тиков
+        # накопилось за реальное время кадра; физика внутри тика делится на подшаги
+        self._physics_dt = 1.0 / SIM_HZ
+        self.substeps = max(1, PHYSICS_SUBSTEPS)
+        self.max_catchup_ticks = MAX_CATCHUP_TICKS
+        self._accumulator = 0.0
+        self.render_alpha = 1.0  # доля тика между предыдущим и текущим состоянием (для интерполяции)
+        self.ticks = 0
+        self.dropped_time = 0.0  # секунды отставания, отброшенные из-за MAX_CATCHUP_TICKS
+        # игровое время (мс) — растет на шаг физики, не зависит от реального FPS
+        self.time_ms = 0.0
+
+        # отложенная работа (перекраска спрайтов, перерисовка полос) — не больше бюджета за кадр
+        self.scheduler = FrameScheduler()
 
         # системы
-        self.block_system = BlockSystem(pm_space=self.space)
+        if snapshot is not None:
+            self.block_system = BlockSystem(pm_space=self.space, rng=world_rng, grid=snapshot.world_grid(),
+                                            scroll_y=snapshot.scroll_y, focus_y=snapshot.body_position[1],
+                                            scheduler=self.scheduler, on_redraw=self._world_redrawn)
+        else:
+            self.block_system = BlockSystem(pm_space=self.space, rng=world_rng, scheduler=self.scheduler,
+                                            on_redraw=self._world_redrawn)
         self.pickaxe = Pickaxe(self.space)
-        self.particles = ParticleSystem()
+        self.particles = ParticleSystem(seed=particles_seed)
 
         # скролл (камера)
         self.scroll_y = 0.0
+        self._prev_scroll_y = 0.0
         self.scroll_target = 0.0
         self.scroll_frames_left = 0
 
         # фон
-        self.background = pygame.image.load("assets/backgrounds/background.png").convert()
-        self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        self.border_texture = pygame.image.load("assets/blocks/bedrock/bedrock.png").convert_alpha()
-        self.border_texture = pygame.transform.scale(self.border_texture, (BLOCK_SIZE, BLOCK_SIZE))
+        self.background = assets.image("assets/backgrounds/background.png",
+                                        (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False, smooth=False)
+        self.border_texture = assets.image("assets/blocks/bedrock/bedrock.png",
+                                           (BLOCK_SIZE, BLOCK_SIZE), smooth=False)
+
+        # фон и бордеры не меняются — собираем их один раз в общий статический слой
+        self.static_layer = self._build_static_layer()
+
+        # dirty-rect режим: draw() возвращает измененные области для display.update(rects)
+        self.dirty_rects = dirty_rects
+        self._full_redraw = True
+        self._last_scroll_px = None
+        self._last_pickaxe_rect = None
+        self._last_particles_rect = None
+        self._damaged_rects = []  # мировые прямоугольники блоков, получивших урон
 
         # ресурсы
         self.resources = {
@@ -43,13 +117,23 @@ class Game:
             "lapis": 0,
             "redstone": 0,
         }
-        self.resource_icons = {}
-        for name, path in RESOURCE_ICONS.items():
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                self.resource_icons[name] = pygame.transform.smoothscale(img, (32, 32))
-            except Exception:
-                self.resource_icons[name] = None
+        self.blocks_destroyed = 0
+        assets.preload(RESOURCE_ICONS.values())
+        self.resource_icons = {name: assets.image(path, (32, 32)) for name, path in RESOURCE_ICONS.items()}
+        logger.info("Ассеты загружены: %.1f мс (подробно — assets.report())", assets.total_ms)
+
+        # текст и HUD: шрифты создаются один раз, надписи кэшируются
+        self.text = TextCache()
+        self.hud = Hud(self.text, self.resource_icons)
+        self.block_labels = BlockLabels(self.text)
+        self.show_hitboxes = DEBUG_HITBOXES
+
+        # адаптивное качество: кормится временем кадра из главного цикла (main.py)
+        self.quality = QualityController(self) if QUALITY_ADAPTIVE else None
+
+        # оверлей производительности (PERF_OVERLAY_KEY): пока выключен, профайлера нет вовсе
+        self.profiler: Optional[FrameProfiler] = None
+        self.perf_overlay: Optional[PerfOverlay] = None
 
         # хэндлер столкновений для новой версии Pymunk
         self.space.on_collision(1, 2,
@@ -59,60 +143,96 @@ class Game:
 
         self.draw_options = pymunk.pygame_util.DrawOptions(screen)
 
+        if snapshot is not None:
+            snapshot.apply(self)
+
     # == управление ==
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_LEFT:
-                self.pickaxe.move_left()
-            elif event.key == pygame.K_RIGHT:
-                self.pickaxe.move_right()
-            # Убираем ручное управление движением вниз
-            elif event.key == pygame.K_SPACE:
-                if not self.pickaxe.active:
-                    self.pickaxe.activate(self.pickaxe.type, self.pickaxe.size)
-            elif event.key == pygame.K_1:
-                self.pickaxe.apply_command("!wood")
-            elif event.key == pygame.K_2:
-                self.pickaxe.apply_command("!stone")
-            elif event.key == pygame.K_3:
-                self.pickaxe.apply_command("!iron")
-            elif event.key == pygame.K_4:
-                self.pickaxe.apply_command("!gold")
-            elif event.key == pygame.K_5:
-                self.pickaxe.apply_command("!diamond")
-            elif event.key == pygame.K_6:
-                self.pickaxe.apply_command("!netherite")
-            elif event.key == pygame.K_l:
-                self.pickaxe.apply_command("!large")
-            elif event.key == pygame.K_s:
-                self.pickaxe.apply_command("!small")
-            elif event.key == pygame.K_d:
-                self.block_system.apply_chat_command("!spawn diamond")
+            if event.key == PERF_OVERLAY_KEY:
+                # не игровая команда — в запись сессии не попадает
+                self.toggle_perf_overlay()
+                return
+            command = KEY_COMMANDS.get(event.key)
+            if command is not None:
+                self.apply_command(command)
 
         # Убираем обработку KEYUP для упрощения
 
+    def toggle_perf_overlay(self):
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+            self.perf_overlay = PerfOverlay(self.text)
+        else:
+            self.profiler = None
+            self.perf_overlay = None
+        self._full_redraw = True
+
+    def _perf_counts(self):
+        return {
+            "спрайтов": len(self.block_system.block_sprites),
+            "тел": len(self.space.bodies),
+            "форм": len(self.space.shapes),
+            "частиц": len(self.particles),
+        }
+
+    def _world_redrawn(self, rect: pygame.Rect):
+        """Отложенная работа BlockSystem сменила картинку мира в rect (мировые координаты)."""
+        if self.dirty_rects:
+            self._damaged_rects.append(rect)
+
+    def request_full_redraw(self):
+        """Следующий кадр в dirty-rect режиме перерисовать целиком."""
+        self._full_redraw = True
+
+    def apply_command(self, command: str):
+        """
+        Единая точка входа для клавиш и чат-команд. Применяется между тиками;
+        записывается (с номером тика), если к игре подключен InputRecorder.
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.ticks, command)
+        # команды могут поменять кирку или весь мир — проще перерисовать кадр целиком
+        self._full_redraw = True
+        cmd = command.lower()
+        if cmd == "!left":
+            self.pickaxe.move_left()
+        elif cmd == "!right":
+            self.pickaxe.move_right()
+        elif cmd == "!activate":
+            if not self.pickaxe.active:
+                self.pickaxe.activate(self.pickaxe.type, self.pickaxe.size)
+        elif cmd.startswith("!spawn"):
+            self.block_system.apply_chat_command(cmd)
+        else:
+            self.pickaxe.apply_command(cmd)
+
     # == столкновения ==
     def _pickaxe_block_collision(self, arbiter, space, data):
         pick_shape, block_shape = arbiter.shapes
         block = getattr(block_shape, "block_ref", None)
-        if not block or not block.pm_body or block.health <= 0:
+        if not block or not block.pm_shape or block.health <= 0:
             return False
 
         # Убираем принудительную остановку скорости - позволяем физике работать естественно
         # Добавляем небольшой импульс при любом контакте для предотвращения "прилипания"
 
         # Добавляем небольшой импульс при любом контакте для предотвращения "прилипания"
-        contact_impulse_x = random.uniform(-3, 3)
-        contact_impulse_y = random.uniform(-2, 5)  # немного вниз
+        contact_impulse_x = self.rng.uniform(-3, 3)
+        contact_impulse_y = self.rng.uniform(-2, 5)  # немного вниз
         self.pickaxe.body.apply_impulse_at_local_point((contact_impulse_x, contact_impulse_y), (0, 0))
 
         # --- урон ---
-        if self.pickaxe.can_hit_now():
+        if self.pickaxe.can_hit_now(self.time_ms):
             destroyed = block.take_damage(self.pickaxe.type.value["speed"])
+            if self.dirty_rects:
+                # нужны только dirty-rect режиму (очищаются в _collect_dirty_rects)
+                self._damaged_rects.append(pygame.Rect(block.world_x, block.world_y, BLOCK_SIZE, BLOCK_SIZE))
             if destroyed:
+                self.blocks_destroyed += 1
                 # При разрушении блока добавляем дополнительный импульс для продолжения движения
-                destroy_impulse_x = random.uniform(-15, 15)  # более сильный импульс для движения в стороны
-                destroy_impulse_y = random.uniform(10, 40)  # сильный импульс вниз для продолжения падения
+                destroy_impulse_x = self.rng.uniform(-15, 15)  # более сильный импульс для движения в стороны
+                destroy_impulse_y = self.rng.uniform(10, 40)  # сильный импульс вниз для продолжения падения
                 self.pickaxe.body.apply_impulse_at_local_point((destroy_impulse_x, destroy_impulse_y), (0, 0))
 
                 # Обработка ресурсов только при разрушении блока
@@ -127,19 +247,13 @@ class Game:
                 if block.type in resmap:
                     self.resources[resmap[block.type]] += 1
                 elif block.type == BlockType.LAPIS:
-                    self.resources["lapis"] += random.randint(1, 5)
+                    self.resources["lapis"] += self.rng.randint(1, 5)
                 elif block.type == BlockType.REDSTONE:
-                    self.resources["redstone"] += random.randint(1, 5)
-
-                # Используем позицию физического тела для эффекта частиц
-                if block.pm_body is not None:
-                    effect_x = block.pm_body.position.x - BLOCK_SIZE // 2
-                    effect_y = block.pm_body.position.y - BLOCK_SIZE // 2
-                else:
-                    effect_x = block.world_x
-                    effect_y = block.world_y
+                    self.resources["redstone"] += self.rng.randint(1, 5)
+
+                # Эффект частиц — в мировых координатах блока
                 self.particles.add_block_break_effect(
-                    effect_x, effect_y, block.type.value["color"]
+                    block.world_x, block.world_y, block.type.value["color"]
                 )
             else:
                 # При простом ударе по блоку - вообще без импульса, чтобы кирка оставалась на месте
@@ -152,7 +266,7 @@ class Game:
         pick_shape, block_shape = arbiter.shapes
         block = getattr(block_shape, "block_ref", None)
         if block:
-            print(f"НАЧАЛО КОНТАКТА с блоком {block.id}")  # отладка
+            logger.debug("НАЧАЛО КОНТАКТА с блоком %s", block.id)
             self.pickaxe.begin_contact(block.id)  # исправляем - передаем ID, а не health
         return True
 
@@ -161,17 +275,70 @@ class Game:
         pick_shape, block_shape = arbiter.shapes
         block = getattr(block_shape, "block_ref", None)
         if block:
-            print(f"КОНЕЦ КОНТАКТА с блоком {block.id}")  # отладка
+            logger.debug("КОНЕЦ КОНТАКТА с блоком %s", block.id)
             self.pickaxe.end_contact()
         return True
 
     # == обновление ==
+    def advance(self, frame_dt: float) -> int:
+        """
+        Прогоняет столько фиксированных тиков, сколько накопилось за frame_dt
+        (секунды реального времени), но не больше max_catchup_ticks — после
+        долгого подвисания лишнее отставание отбрасывается, а не догоняется.
+        Возвращает число тиков; render_alpha — остаток для интерполяции.
+        """
+        dt = self._physics_dt
+        self._accumulator += frame_dt
+        ticks = 0
+        while self._accumulator >= dt and ticks < self.max_catchup_ticks:
+            self.update()
+            self._accumulator -= dt
+            ticks += 1
+        if self._accumulator >= dt:
+            dropped = self._accumulator - self._accumulator % dt
+            self.dropped_time += dropped
+            self._accumulator -= dropped
+            logger.debug("Отставание %.0f мс отброшено (лимит %d тиков за кадр)",
+                         dropped * 1000.0, self.max_catchup_ticks)
+        self.render_alpha = self._accumulator / dt
+        prof = self.profiler
+        t = perf_counter() if prof is not None else 0.0
+        self.scheduler.run()
+        if prof is not None:
+            prof.lap("scheduler", t)
+        return ticks
+
+    def _render_scroll(self) -> float:
+        """Камера для отрисовки: между предыдущим и текущим тиком."""
+        alpha = self.render_alpha
+        if alpha >= 1.0:
+            return self.scroll_y
+        return self._prev_scroll_y + (self.scroll_y - self._prev_scroll_y) * alpha
+
     def update(self):
-        # шаг физики
-        self.space.step(self._physics_dt)
+        """Один фиксированный тик логики (1 / SIM_HZ секунды игрового времени)."""
+        self._prev_scroll_y = self.scroll_y
+        self.pickaxe.save_pose()
+        # вызов update() напрямую (headless) — рисуем текущее состояние без интерполяции
+        self.render_alpha = 1.0
+
+        # замеры фаз — только при включенном оверлее производительности
+        prof = self.profiler
+        t = perf_counter() if prof is not None else 0.0
+
+        # шаг физики: подшаги короче — быстрая кирка не проскакивает блоки
+        sub_dt = self._physics_dt / self.substeps
+        for _ in range(self.substeps):
+            self.space.step(sub_dt)
+        self.time_ms += self._physics_dt * 1000.0
+        self.ticks += 1
+        if prof is not None:
+            t = prof.lap("space.step", t)
 
         # обновляем кирку и частицы
         self.particles.update()
+        if prof is not None:
+            t = prof.lap("particles.update", t)
 
         # Плавный скролл камеры - следует за киркой, но с ограничениями
         if self.pickaxe.body is not None:
@@ -206,8 +373,10 @@ class Game:
                     self.pickaxe.body.velocity = (self.pickaxe.body.velocity.x, max(self.pickaxe.body.velocity.y - 5, -30))
 
             # Расширенная отладка для анализа проблемы формы
-            vx, vy = self.pickaxe.body.velocity
-            print(f"Камера: кирка Y={pickaxe_y:.1f}, экран Y={screen_pickaxe_y:.1f}, скорость=({vx:.1f}, {vy:.1f}), скролл={self.scroll_y}, контакт={self.pickaxe.in_contact}")  # отладка
+            if logger.isEnabledFor(logging.DEBUG):
+                vx, vy = self.pickaxe.body.velocity
+                logger.debug("Камера: кирка Y=%.1f, экран Y=%.1f, скорость=(%.1f, %.1f), скролл=%s, контакт=%s",
+                             pickaxe_y, screen_pickaxe_y, vx, vy, self.scroll_y, self.pickaxe.in_contact)
 
         # дополнительный скролл при необходимости (для совместимости)
         if self.scroll_frames_left > 0:
@@ -215,10 +384,17 @@ class Game:
             delta = remaining / self.scroll_frames_left
             self.scroll_y += delta
             self.scroll_frames_left -= 1
+        if prof is not None:
+            t = prof.lap("camera", t)
 
         self.pickaxe.update(self.scroll_y)
+        if prof is not None:
+            t = prof.lap("pickaxe.update", t)
         # обновляем блоки (только экранные позиции!)
-        self.block_system.update(self.scroll_y)
+        focus_y = self.pickaxe.body.position.y if self.pickaxe.body is not None else None
+        self.block_system.update(self.scroll_y, focus_y)
+        if prof is not None:
+            prof.lap("block_system.update", t)
 
     # == отрисовка ==
     def _draw_background(self, screen):
@@ -226,20 +402,17 @@ class Game:
         pygame.draw.rect(screen, (50, 50, 60), (0, 0, BORDER_WIDTH, SCREEN_HEIGHT))
         pygame.draw.rect(screen, (50, 50, 60), (SCREEN_WIDTH - BORDER_WIDTH, 0, BORDER_WIDTH, SCREEN_HEIGHT))
 
-    def _draw_blocks(self, screen):
-        self.block_system.draw(screen)
+    def _build_static_layer(self) -> pygame.Surface:
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self._draw_background(layer)
+        self._draw_borders(layer, self.border_texture)
+        return prepare_surface(layer, alpha=False)
+
+    def _draw_blocks(self, screen, scroll_y):
+        self.block_system.draw(screen, scroll_y)
 
         # HP над блоками
-        font = pygame.font.SysFont(None, 18)
-        for b in self.block_system.block_sprites:
-            if b.health <= 0:
-                continue
-            hp_text = font.render(str(b.health), True, (255, 255, 255))
-            shadow = font.render(str(b.health), True, (0, 0, 0))
-            tx = b.rect.centerx - hp_text.get_width() // 2
-            ty = b.rect.centery
-            screen.blit(shadow, (tx + 1, ty + 1))
-            screen.blit(hp_text, (tx, ty))
+        self.block_labels.draw(screen, self.block_system.visible_blocks(scroll_y))
 
     def _draw_borders(self, surface: pygame.Surface, texture: pygame.Surface):
         # Левый бордер
@@ -252,18 +425,12 @@ class Game:
             surface.blit(texture, (x_right, y),
                          area=pygame.Rect(texture.get_width() - BORDER_WIDTH, 0, BORDER_WIDTH, texture.get_height()))
 
-    def _draw_particles(self, screen):
-        for p in self.particles.particles:
-            alpha = min(255, p['life'] * 8)
-            color = (*p['color'], alpha)
-            surf = pygame.Surface((4, 4), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (2, 2), 2)
-            screen.blit(surf, (p['x'], p['y'] - self.scroll_y))
+    def _draw_particles(self, screen, scroll_y):
+        self.particles.draw(screen, scroll_y)
 
-    def _draw_pickaxe(self, screen):
-        rect = self.pickaxe.get_rect()
-        # rect.y -= int(self.scroll_y)  # Убираем двойное вычитание scroll_y
-        screen.blit(self.pickaxe.image, rect)
+    def _draw_pickaxe(self, screen, scroll_y):
+        image, rect = self.pickaxe.render_frame(scroll_y, self.render_alpha)
+        screen.blit(image, rect)
 
         # Индикатор контакта - красный когда касается, зеленый когда нет
         contact_color = (255, 0, 0) if self.pickaxe.in_contact else (0, 255, 0)
@@ -274,56 +441,25 @@ class Game:
             pygame.draw.line(screen, (255, 255, 0), rect.center, (rect.centerx, rect.centery - 10), 2)
 
     def _draw_hud(self, screen):
-        font = pygame.font.SysFont("Arial", 24)
-        y = 10
-        for name, value in self.resources.items():
-            icon = self.resource_icons.get(name)
-            if icon:
-                screen.blit(icon, (10, y))
-            txt = font.render(str(value), True, (255, 255, 255))
-            screen.blit(txt, (50, y + 4))
-            y += 36
-
-        depth = -(int(self.pickaxe.body.position.y // BLOCK_SIZE))
-        depth_txt = font.render(f"Y: {depth}", True, (255, 255, 0))
-        screen.blit(depth_txt, (10, y))
-
-        # Информация о контакте
-        y += 30
-        contact_status = "Контакт: ДА" if self.pickaxe.in_contact else "Контакт: НЕТ"
-        contact_color = (0, 255, 0) if self.pickaxe.in_contact else (255, 0, 0)
-        contact_txt = font.render(contact_status, True, contact_color)
-        screen.blit(contact_txt, (10, y))
-
-        # Упрощенная информация об управлении
-        y += 30
-        control_hint = "← → движение, ПРОБЕЛ активировать"
-        hint_color = (200, 200, 200)  # серый
-        hint_txt = font.render(control_hint, True, hint_color)
-        screen.blit(hint_txt, (10, y))
-
-        # Упрощенная отладочная информация
-        y += 30
-        if self.pickaxe.body:
-            pos_info = f"Позиция: ({int(self.pickaxe.body.position.x)}, {int(self.pickaxe.body.position.y)})"
-            pos_txt = font.render(pos_info, True, (255, 255, 0))
-            screen.blit(pos_txt, (10, y))
-
-    def _draw_hitboxes(self, screen):
-        """Отладочная отрисовка хитбоксов"""
+        self.hud.draw(screen, *self._hud_args())
+
+    def _draw_hitboxes(self, screen, scroll_y):
+        """Отладочная отрисовка хитбоксов (в той же интерполированной позе, что и спрайты)"""
         # Рисуем хитбокс кирки
         if self.pickaxe.body and self.pickaxe.active:
+            px, py, angle = self.pickaxe.render_pose(self.render_alpha)
             for shape in self.pickaxe.shapes:
                 if isinstance(shape, pymunk.Poly):
                     # Получаем вершины полигона
-                    vertices = shape.get_vertices()
+                    # вершины формы локальные — поворачиваем и сдвигаем в позу отрисовки
+                    vertices = [v.rotated(angle) + (px, py) for v in shape.get_vertices()]
                     if len(vertices) >= 3:  # треугольник или больше
                         # Преобразуем мировые координаты в экранные
                         screen_vertices = []
                         for vertex in vertices:
                             world_x, world_y = vertex
                             screen_x = int(world_x)
-                            screen_y = int(world_y - self.scroll_y)
+                            screen_y = int(world_y - scroll_y)
                             screen_vertices.append((screen_x, screen_y))
 
                         # Рисуем красный контур хитбокса
@@ -331,15 +467,16 @@ class Game:
                             pygame.draw.polygon(screen, (255, 0, 0), screen_vertices, 2)
             
             # Рисуем центр физического тела кирки
-            center_x = int(self.pickaxe.body.position.x)
-            center_y = int(self.pickaxe.body.position.y - self.scroll_y)
+            center_x = int(px)
+            center_y = int(py - scroll_y)
             pygame.draw.circle(screen, (0, 255, 0), (center_x, center_y), 3)  # зеленый центр
             
             # Рисуем контур спрайта кирки для сравнения
-            pygame.draw.rect(screen, (0, 0, 255), self.pickaxe.rect, 2)  # синий контур спрайта
+            sprite_rect = self.pickaxe.render_frame(scroll_y, self.render_alpha)[1]
+            pygame.draw.rect(screen, (0, 0, 255), sprite_rect, 2)  # синий контур спрайта
 
         # Рисуем хитбоксы блоков
-        for block in self.block_system.block_sprites:
+        for block in self.block_system.visible_blocks(scroll_y):
             if block.pm_shape and isinstance(block.pm_shape, pymunk.Poly):
                 vertices = block.pm_shape.get_vertices()
                 if len(vertices) >= 3:
@@ -347,22 +484,105 @@ class Game:
                     for vertex in vertices:
                         world_x, world_y = vertex
                         screen_x = int(world_x)
-                        screen_y = int(world_y - self.scroll_y)
+                        screen_y = int(world_y - scroll_y)
                         screen_vertices.append((screen_x, screen_y))
 
                     # Рисуем синий контур для блоков
                     if len(screen_vertices) >= 3:
                         pygame.draw.polygon(screen, (0, 0, 255), screen_vertices, 1)
 
+    def _hud_args(self):
+        body = self.pickaxe.body
+        depth, pos = 0, None
+        if body is not None:
+            depth = -(int(body.position.y // BLOCK_SIZE))
+            pos = (int(body.position.x), int(body.position.y))
+        return self.resources, depth, self.pickaxe.in_contact, pos
+
+    def _collect_dirty_rects(self, screen, scroll_y):
+        """
+        Области, изменившиеся с прошлого кадра. Если камера сдвинулась (или кадр
+        помечен на полную перерисовку) — весь экран.
+        """
+        screen_rect = screen.get_rect()
+        scroll_px = int(scroll_y)
+        pickaxe_rect = self.pickaxe.render_frame(scroll_y, self.render_alpha)[1].inflate(8, 24)
+        particles_rect = self.particles.bounds(scroll_y)
+
+        # оверлей производительности меняется каждый кадр — с ним кадр рисуется целиком
+        full = self._full_redraw or scroll_px != self._last_scroll_px or self.profiler is not None
+        rects = [screen_rect] if full else []
+        if not full:
+            rects.append(pickaxe_rect)
+            if self._last_pickaxe_rect is not None:
+                rects.append(self._last_pickaxe_rect)
+            for r in (particles_rect, self._last_particles_rect):
+                if r is not None:
+                    rects.append(r)
+            for r in self._damaged_rects:
+                rects.append(r.move(0, -scroll_px))
+            rects.extend(self.hud.dirty_rects(*self._hud_args()))
+            rects = [r.clip(screen_rect) for r in rects]
+            rects = [r for r in rects if r.width and r.height]
+
+        self._full_redraw = False
+        self._last_scroll_px = scroll_px
+        self._last_pickaxe_rect = pickaxe_rect
+        self._last_particles_rect = particles_rect
+        self._damaged_rects.clear()
+        return rects
+
     def draw(self, screen):
-        self._draw_background(screen)
-        self._draw_borders(screen, self.border_texture)
-        self._draw_blocks(screen)
-        self._draw_particles(screen)
-        self._draw_pickaxe(screen)
+        """
+        Рисует кадр. В dirty-rect режиме возвращает список измененных областей
+        для pygame.display.update(rects) (пустой — показывать нечего),
+        иначе None — нужен полный flip().
+        """
+        scroll_y = self._render_scroll()
+        rects = None
+        if self.dirty_rects:
+            rects = self._collect_dirty_rects(screen, scroll_y)
+            if not rects:
+                return rects
+            screen.set_clip(rects[0].unionall(rects[1:]))
+
+        if self.profiler is not None:
+            self._draw_profiled(screen, scroll_y)
+            if rects is not None:
+                screen.set_clip(None)
+            return rects
+
+        screen.blit(self.static_layer, (0, 0))
+        self._draw_blocks(screen, scroll_y)
+        self._draw_particles(screen, scroll_y)
+        self._draw_pickaxe(screen, scroll_y)
         self._draw_hud(screen)
 
-        # Включаем отладку хитбоксов для диагностики проблемы
-        self._draw_hitboxes(screen)  # включи при отладке
+        # отладка хитбоксов (DEBUG_HITBOXES; адаптивное качество выключает ее первой)
+        if self.show_hitboxes:
+            self._draw_hitboxes(screen, scroll_y)
         # self.space.debug_draw(self.draw_options)  # pymunk отладка
-        
+
+        if rects is not None:
+            screen.set_clip(None)
+        return rects
+
+    def _draw_profiled(self, screen, scroll_y):
+        """Тот же кадр, что в draw(), но с замером каждой стадии и оверлеем поверх."""
+        prof = self.profiler
+        t = perf_counter()
+        screen.blit(self.static_layer, (0, 0))
+        t = prof.lap("_draw_static", t)
+        self._draw_blocks(screen, scroll_y)
+        t = prof.lap("_draw_blocks", t)
+        self._draw_particles(screen, scroll_y)
+        t = prof.lap("_draw_particles", t)
+        self._draw_pickaxe(screen, scroll_y)
+        t = prof.lap("_draw_pickaxe", t)
+        self._draw_hud(screen)
+        t = prof.lap("_draw_hud", t)
+        if self.show_hitboxes:
+            self._draw_hitboxes(screen, scroll_y)
+            prof.lap("_draw_hitboxes", t)
+        prof.end_frame()
+        self.perf_overlay.draw(screen, prof, self._perf_counts)
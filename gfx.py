@@ -0,0 +1,18 @@
+# gfx.py
+import pygame
+
+
+def prepare_surface(surface: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+    """
+    Приводит поверхность к формату экрана (convert/convert_alpha).
+    Если режим экрана не задан (headless), возвращает поверхность как есть —
+    convert() без display.set_mode() бросает pygame.error.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def load_image(path: str, alpha: bool = True) -> pygame.Surface:
+    """pygame.image.load + prepare_surface."""
+    return prepare_surface(pygame.image.load(path), alpha)
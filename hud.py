@@ -0,0 +1,189 @@
+# hud.py
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from settings import SCREEN_WIDTH, BLOCK_LABEL_MODE
+
+Color = Tuple[int, int, int]
+
+HUD_FONT = ("Arial", 24)
+HUD_LINE = 30
+HUD_ICON_LINE = 36
+
+
+class TextCache:
+    """
+    Шрифты создаются один раз (SysFont ищет файл шрифта при каждом вызове),
+    отрендеренные надписи кэшируются по (текст, цвет, шрифт, размер) с LRU-вытеснением.
+    """
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self._labels: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def font(self, name: Optional[str], size: int) -> pygame.font.Font:
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, text: str, color: Color, size: int, name: Optional[str] = None,
+               cache: bool = True) -> pygame.Surface:
+        """Надпись из кэша; cache=False — для часто меняющихся значений, чтобы не вытеснять остальное."""
+        if not cache:
+            return self.font(name, size).render(text, True, color)
+        key = (text, color, name, size)
+        surf = self._labels.get(key)
+        if surf is None:
+            surf = self.font(name, size).render(text, True, color)
+            self._labels[key] = surf
+            if len(self._labels) > self.max_entries:
+                self._labels.popitem(last=False)
+        else:
+            self._labels.move_to_end(key)
+        return surf
+
+
+class Hud:
+    """
+    Панель HUD (ресурсы, глубина, контакт, подсказка) рендерится в отдельную
+    поверхность и перерисовывается, только когда меняется ресурс, глубина
+    или контакт; в остальные кадры — один blit. Позиция кирки меняется почти
+    каждый кадр, поэтому рисуется отдельной строкой поверх панели.
+    """
+    def __init__(self, text: TextCache, resource_icons: Dict[str, Optional[pygame.Surface]]):
+        self.text = text
+        self.resource_icons = resource_icons
+        self._state = None
+        self._panel: Optional[pygame.Surface] = None
+        self._pos: Optional[Tuple[int, int]] = None
+        self._pos_y = 0  # строка позиции внутри области панели
+        self.redraws = 0
+
+    def _panel_height(self, n_resources: int) -> int:
+        return 10 + n_resources * HUD_ICON_LINE + 4 * HUD_LINE + HUD_FONT[1] + 8
+
+    def _render_panel(self, resources: Dict[str, int], depth: int, in_contact: bool):
+        height = self._panel_height(len(resources))
+        if self._panel is None or self._panel.get_height() != height:
+            self._panel = pygame.Surface((SCREEN_WIDTH, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 0))
+        font_name, size = HUD_FONT
+        render = self.text.render
+
+        y = 10
+        for name, value in resources.items():
+            icon = self.resource_icons.get(name)
+            if icon:
+                panel.blit(icon, (10, y))
+            panel.blit(render(str(value), (255, 255, 255), size, font_name), (50, y + 4))
+            y += HUD_ICON_LINE
+
+        panel.blit(render(f"Y: {depth}", (255, 255, 0), size, font_name), (10, y))
+
+        # Информация о контакте
+        y += HUD_LINE
+        contact_status = "Контакт: ДА" if in_contact else "Контакт: НЕТ"
+        contact_color = (0, 255, 0) if in_contact else (255, 0, 0)
+        panel.blit(render(contact_status, contact_color, size, font_name), (10, y))
+
+        # Упрощенная информация об управлении
+        y += HUD_LINE
+        control_hint = "← → движение, ПРОБЕЛ активировать"
+        panel.blit(render(control_hint, (200, 200, 200), size, font_name), (10, y))
+
+        # место под строку позиции — она рисуется в draw() каждый кадр
+        y += HUD_LINE
+        self._pos_y = y
+
+        self.redraws += 1
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Область экрана, которую занимает панель (вместе со строкой позиции)."""
+        if self._panel is None:
+            return pygame.Rect(0, 0, 0, 0)
+        return self._panel.get_rect()
+
+    @property
+    def pos_rect(self) -> pygame.Rect:
+        """Полоса строки позиции (во всю ширину — старый текст мог быть длиннее)."""
+        if self._panel is None:
+            return pygame.Rect(0, 0, 0, 0)
+        return pygame.Rect(0, self._pos_y, self._panel.get_width(), HUD_FONT[1] + 4)
+
+    def is_stale(self, resources: Dict[str, int], depth: int, in_contact: bool) -> bool:
+        """Нужно ли перерисовать панель (ресурсы, глубина или контакт изменились)."""
+        return (tuple(resources.items()), depth, in_contact) != self._state
+
+    def dirty_rects(self, resources: Dict[str, int], depth: int, in_contact: bool,
+                    pos: Optional[Tuple[int, int]]) -> List[pygame.Rect]:
+        """Области HUD, изменившиеся с прошлой отрисовки (для dirty-rect режима)."""
+        if self.is_stale(resources, depth, in_contact):
+            return [self.rect]
+        if pos != self._pos:
+            return [self.pos_rect]
+        return []
+
+    def draw(self, screen: pygame.Surface, resources: Dict[str, int], depth: int,
+             in_contact: bool, pos: Optional[Tuple[int, int]]):
+        if self.is_stale(resources, depth, in_contact):
+            self._render_panel(resources, depth, in_contact)
+            self._state = (tuple(resources.items()), depth, in_contact)
+        screen.blit(self._panel, (0, 0))
+
+        # Упрощенная отладочная информация
+        self._pos = pos
+        if pos is not None:
+            font_name, size = HUD_FONT
+            pos_info = f"Позиция: ({pos[0]}, {pos[1]})"
+            screen.blit(self.text.render(pos_info, (255, 255, 0), size, font_name, cache=False), (10, self._pos_y))
+
+
+class BlockLabels:
+    """
+    HP над блоками. Числа пререндерятся один раз вместе с тенью
+    (атлас значение -> поверхность), на кадр — один blits по видимым блокам.
+
+    Режимы: "all" — у всех блоков, "damaged" — только у поврежденных, "off" — выключено.
+    """
+    MODES = ("all", "damaged", "off")
+    FONT = (None, 18)
+
+    def __init__(self, text: TextCache, mode: str = BLOCK_LABEL_MODE):
+        if mode not in self.MODES:
+            raise ValueError(f"неизвестный режим подписей: {mode}")
+        self.text = text
+        self.mode = mode
+        self._atlas: Dict[int, pygame.Surface] = {}
+
+    def _label(self, value: int) -> pygame.Surface:
+        surf = self._atlas.get(value)
+        if surf is None:
+            font = self.text.font(*self.FONT)
+            txt = font.render(str(value), True, (255, 255, 255))
+            shadow = font.render(str(value), True, (0, 0, 0))
+            surf = pygame.Surface((txt.get_width() + 1, txt.get_height() + 1), pygame.SRCALPHA)
+            surf.blit(shadow, (1, 1))
+            surf.blit(txt, (0, 0))
+            self._atlas[value] = surf
+        return surf
+
+    def draw(self, screen: pygame.Surface, blocks: Iterable):
+        """blocks — видимые блоки с актуальным rect (BlockSystem.visible_blocks())."""
+        if self.mode == "off":
+            return
+        damaged_only = self.mode == "damaged"
+        batch = []
+        for b in blocks:
+            if damaged_only and b.health >= b.max_health:
+                continue
+            label = self._label(b.health)
+            batch.append((label, (b.rect.centerx - (label.get_width() - 1) // 2, b.rect.centery)))
+        if batch:
+            screen.blits(batch, doreturn=False)
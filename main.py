@@ -1,28 +1,131 @@
+import argparse
 import pygame
-from game import Game
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RECTS, RENDER_FPS_LIMIT, SNAPSHOT_AUTOSAVE_SECONDS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Miner in the cave")
+    parser.add_argument("--headless", action="store_true",
+                        help="прогон без окна и без ограничения FPS, в конце — сводка")
+    parser.add_argument("--frames", type=int, default=None, help="сколько кадров прогнать (headless)")
+    parser.add_argument("--seconds", type=float, default=None, help="бюджет реального времени (headless)")
+    parser.add_argument("--draw", action="store_true", help="рисовать кадры во внеэкранную поверхность (headless)")
+    parser.add_argument("--seed", type=int, default=None, help="seed генерации мира")
+    parser.add_argument("--dirty-rects", action="store_true", default=DIRTY_RECTS,
+                        help="обновлять на экране только измененные области вместо flip()")
+    parser.add_argument("--save", metavar="PATH",
+                        help="продолжить игру из снимка (если он есть), сохранять его периодически и при выходе")
+    parser.add_argument("--record", metavar="PATH", help="записать сессию (seed + команды) в файл")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="воспроизвести запись без окна на максимальной скорости и сверить результат")
+    parser.add_argument("--fps", type=int, default=RENDER_FPS_LIMIT,
+                        help="ограничение FPS отрисовки (0 — без ограничения); логика всегда тикает с SIM_HZ")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="не снижать качество эффектов автоматически при просадках FPS")
+    parser.add_argument("--perf-overlay", action="store_true",
+                        help="сразу показать оверлей производительности (переключается F3)")
+    args = parser.parse_args(argv)
+    if args.save and args.record:
+        # запись воспроизводится с seed на свежем мире, а не со снимка — сверка бы не сошлась
+        parser.error("--record нельзя совмещать с --save: запись начинается с нового мира по seed")
+    return args
+
+
+def run_headless(args):
+    from simulation import run_headless as simulate
+
+    frames = args.frames
+    if frames is None and args.seconds is None:
+        frames = 3600
+    stats = simulate(frames=frames, seconds=args.seconds, draw=args.draw, seed=args.seed)
+    print(stats.summary())
+
+
+def run_replay(args):
+    from replay import Recording, replay
+
+    recording = Recording.load(args.replay)
+    result = replay(recording, draw=args.draw)
+    print(result.stats.summary())
+    print(f"Команд: {len(recording.events)}, seed: {recording.seed}")
+    if result.matches:
+        print("Состояние совпало с записью")
+    else:
+        print("РАСХОЖДЕНИЕ: состояние в конце не совпало с записью")
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay:
+        run_replay(args)
+        return
+    if args.headless:
+        run_headless(args)
+        return
+
+    from game import Game
 
-def main():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Miner in the cave")
     clock = pygame.time.Clock()
 
-    game = Game(screen)
-    running = True
+    game = None
+    if args.save:
+        from snapshot import try_load_snapshot
+        game = try_load_snapshot(args.save, screen, dirty_rects=args.dirty_rects)
+    if game is None:
+        game = Game(screen, dirty_rects=args.dirty_rects, seed=args.seed)
+    if args.fixed_quality:
+        game.quality = None
+    if args.perf_overlay:
+        game.toggle_perf_overlay()
+    recorder = None
+    if args.record:
+        from replay import InputRecorder
+        recorder = InputRecorder(game)
+    clock.tick()
+
+    try:
+        _loop(game, screen, clock, args)
+    finally:
+        if recorder is not None:
+            recorder.save(args.record)
+        if args.save:
+            from snapshot import save_snapshot
+            save_snapshot(game, args.save)
+    pygame.quit()
 
+
+def _loop(game, screen, clock, args):
+    running = True
+    autosave_at = pygame.time.get_ticks() + SNAPSHOT_AUTOSAVE_SECONDS * 1000
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             game.handle_input(event)
 
-        game.update()
-        game.draw(screen)
-        pygame.display.flip()
-        clock.tick(60)
+        # логика — фиксированными тиками по накопленному реальному времени,
+        # отрисовка — с интерполяцией между тиками
+        game.advance(clock.get_time() / 1000.0)
+        rects = game.draw(screen)
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        clock.tick(args.fps)
+        if game.quality is not None:
+            # время работы кадра без сна внутри tick() — по нему видно, успеваем ли
+            game.quality.observe(clock.get_rawtime())
+
+        # периодический снимок — на случай падения или перезапуска
+        if args.save and pygame.time.get_ticks() >= autosave_at:
+            from snapshot import save_snapshot
+            save_snapshot(game, args.save)
+            autosave_at = pygame.time.get_ticks() + SNAPSHOT_AUTOSAVE_SECONDS * 1000
 
-    pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
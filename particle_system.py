@@ -1,27 +1,120 @@
 import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 import pygame
-from settings import BLOCK_SIZE
+from settings import BLOCK_SIZE, PARTICLE_CAPACITY, PARTICLE_GRAVITY, PARTICLE_ALPHA_BUCKETS
+
+PARTICLE_RADIUS = 2
+
 
 class ParticleSystem:
-    def __init__(self, particle_count=15, particle_life=30):
-        self.particles = []
+    """
+    Частицы в виде структуры массивов NumPy (x, y, скорости, жизнь, цвет)
+    с кольцевым буфером фиксированной емкости. Интегрирование векторное,
+    отрисовка — пререндеренными спрайтами (цвет, градация альфы) одним blits.
+    """
+    def __init__(self, particle_count=15, particle_life=30,
+                 capacity=PARTICLE_CAPACITY, gravity=PARTICLE_GRAVITY, seed: Optional[int] = None):
         self.particle_count = particle_count
         self.particle_life = particle_life
+        self.capacity = capacity
+        self.gravity = gravity
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.speed_x = np.zeros(capacity, dtype=np.float32)
+        self.speed_y = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color_idx = np.zeros(capacity, dtype=np.int16)
+
+        self._head = 0            # куда писать следующую частицу
+        self._frames_left = 0     # сколько кадров еще живет самая долгая частица
+        self._colors: List[Tuple[int, int, int]] = []
+        self._color_ids: Dict[Tuple[int, int, int], int] = {}
+        self._sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        # seed задает Game (свой поток случайности); без него — из random
+        self._rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+    def __len__(self):
+        if self._frames_left <= 0:
+            return 0
+        return int(np.count_nonzero(self.life > 0))
+
+    def _color_id(self, color) -> int:
+        color = tuple(color[:3])
+        cid = self._color_ids.get(color)
+        if cid is None:
+            cid = len(self._colors)
+            self._colors.append(color)
+            self._color_ids[color] = cid
+        return cid
 
     def add_block_break_effect(self, x, y, color):
-        for _ in range(self.particle_count):
-            self.particles.append({
-                'x': x + random.randint(0, BLOCK_SIZE),
-                'y': y + random.randint(0, BLOCK_SIZE),
-                'color': color,
-                'speed_x': random.uniform(-3, 3),
-                'speed_y': random.uniform(-5, -2),
-                'life': self.particle_life
-            })
+        n = min(self.particle_count, self.capacity)
+        if n <= 0:
+            return
+        idx = (self._head + np.arange(n)) % self.capacity
+        self._head = (self._head + n) % self.capacity
+
+        rng = self._rng
+        self.x[idx] = x + rng.integers(0, BLOCK_SIZE + 1, n)
+        self.y[idx] = y + rng.integers(0, BLOCK_SIZE + 1, n)
+        self.speed_x[idx] = rng.uniform(-3, 3, n)
+        self.speed_y[idx] = rng.uniform(-5, -2, n)
+        self.life[idx] = self.particle_life
+        self.color_idx[idx] = self._color_id(color)
+        self._frames_left = max(self._frames_left, self.particle_life)
 
     def update(self):
-        self.particles = [p for p in self.particles if p['life'] > 0]
-        for p in self.particles:
-            p['x'] += p['speed_x']
-            p['y'] += p['speed_y']
-            p['life'] -= 1
+        if self._frames_left <= 0:
+            return
+        self._frames_left -= 1
+        alive = self.life > 0
+        self.x += self.speed_x
+        self.y += self.speed_y
+        self.speed_y += self.gravity
+        np.subtract(self.life, 1, out=self.life, where=alive)
+
+    # ======= Отрисовка =======
+
+    def bounds(self, scroll_y: float = 0.0) -> Optional[pygame.Rect]:
+        """Экранный прямоугольник, покрывающий все живые частицы (None — частиц нет)."""
+        if self._frames_left <= 0:
+            return None
+        alive = self.life > 0
+        if not alive.any():
+            return None
+        xs = self.x[alive]
+        ys = self.y[alive]
+        x0, y0 = int(xs.min()) - 1, int(ys.min() - scroll_y) - 1
+        x1, y1 = int(xs.max()) + PARTICLE_RADIUS * 2 + 1, int(ys.max() - scroll_y) + PARTICLE_RADIUS * 2 + 1
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def _sprite(self, cid: int, bucket: int) -> pygame.Surface:
+        key = (cid, bucket)
+        surf = self._sprites.get(key)
+        if surf is None:
+            alpha = min(255, bucket * 256 // PARTICLE_ALPHA_BUCKETS)
+            surf = pygame.Surface((PARTICLE_RADIUS * 2, PARTICLE_RADIUS * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*self._colors[cid], alpha),
+                               (PARTICLE_RADIUS, PARTICLE_RADIUS), PARTICLE_RADIUS)
+            self._sprites[key] = surf
+        return surf
+
+    def draw(self, surface: pygame.Surface, scroll_y: float = 0.0):
+        if self._frames_left <= 0:
+            return
+        idx = np.flatnonzero(self.life > 0)
+        if idx.size == 0:
+            return
+        alpha = np.minimum(255, self.life[idx] * 8)
+        buckets = (alpha * PARTICLE_ALPHA_BUCKETS // 256).astype(np.int16)
+        xs = self.x[idx].astype(np.int32).tolist()
+        ys = (self.y[idx] - scroll_y).astype(np.int32).tolist()
+        sprite = self._sprite
+        surface.blits(
+            [(sprite(c, b), (px, py))
+             for c, b, px, py in zip(self.color_idx[idx].tolist(), buckets.tolist(), xs, ys)],
+            doreturn=False,
+        )
@@ -0,0 +1,128 @@
+# perf_overlay.py
+"""
+Оверлей производительности (F3): график времени кадра и разбивка по фазам
+update()/draw() со счетчиками спрайтов, тел/форм pymunk и частиц.
+
+Пока оверлей выключен, Game.profiler = None, и замеры в горячих местах
+сводятся к одной проверке на None.
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+from hud import TextCache
+from settings import PERF_HISTORY_FRAMES, PERF_OVERLAY_REFRESH_FRAMES, QUALITY_TARGET_MS
+
+perf_counter = time.perf_counter
+
+
+class FrameProfiler:
+    """Время фаз за кадр (тики внутри кадра суммируются) и скользящая история."""
+    def __init__(self, history: int = PERF_HISTORY_FRAMES):
+        self.history = history
+        self._current: Dict[str, float] = {}
+        # порядок фаз — как они впервые встретились (update, затем draw)
+        self.phases: Dict[str, Deque[float]] = {}
+        self.frame_ms: Deque[float] = deque(maxlen=history)   # между концами кадров
+        self.work_ms: Deque[float] = deque(maxlen=history)    # сумма замеренных фаз
+        self._last_end: Optional[float] = None
+        self.frames = 0
+
+    def lap(self, name: str, t0: float) -> float:
+        """Добавляет время с t0 к фазе name; возвращает текущий момент (начало следующей фазы)."""
+        now = perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - t0) * 1000.0
+        return now
+
+    def end_frame(self):
+        now = perf_counter()
+        if self._last_end is not None:
+            self.frame_ms.append((now - self._last_end) * 1000.0)
+        self._last_end = now
+        current = self._current
+        for name, hist in self.phases.items():
+            hist.append(current.pop(name, 0.0))
+        for name, ms in current.items():
+            self.phases[name] = deque([ms], maxlen=self.history)
+        self.work_ms.append(sum(h[-1] for h in self.phases.values()))
+        self._current = {}
+        self.frames += 1
+
+    def stats(self, window: int = 60) -> List[Tuple[str, float, float]]:
+        """(фаза, среднее, максимум) мс за последние window кадров."""
+        rows = []
+        for name, hist in self.phases.items():
+            recent = list(hist)[-window:]
+            rows.append((name, sum(recent) / len(recent), max(recent)))
+        return rows
+
+
+class PerfOverlay:
+    """
+    Панель в правом верхнем углу. Текст перерисовывается раз в
+    PERF_OVERLAY_REFRESH_FRAMES кадров (иначе его не прочитать), график — каждый кадр.
+    """
+    FONT = (None, 16)
+    LINE = 14
+    WIDTH = 230
+    GRAPH_H = 48
+    PAD = 4
+
+    def __init__(self, text: TextCache, refresh: int = PERF_OVERLAY_REFRESH_FRAMES,
+                 target_ms: float = QUALITY_TARGET_MS):
+        self.text = text
+        self.refresh = refresh
+        self.target_ms = target_ms
+        self._panel: Optional[pygame.Surface] = None
+        self._age = 0
+
+    def _render_panel(self, profiler: FrameProfiler, counts: Dict[str, int]) -> pygame.Surface:
+        rows = profiler.stats()
+        lines = []
+        if profiler.frame_ms:
+            recent = list(profiler.frame_ms)[-60:]
+            avg = sum(recent) / len(recent)
+            lines.append((f"кадр {avg:5.2f} мс ({1000.0 / avg if avg else 0:.0f} FPS), "
+                          f"макс {max(recent):5.2f}", (255, 255, 255)))
+        lines.append(("фаза            сред.   макс", (180, 180, 180)))
+        for name, avg, peak in rows:
+            color = (255, 120, 120) if peak > self.target_ms * 0.5 else (220, 220, 220)
+            lines.append((f"{name:<18}{avg:6.2f}{peak:7.2f}", color))
+        lines.append((" ".join(f"{k}={v}" for k, v in counts.items()), (180, 220, 255)))
+
+        height = self.GRAPH_H + self.PAD * 3 + len(lines) * self.LINE
+        if self._panel is None or self._panel.get_height() != height:
+            self._panel = pygame.Surface((self.WIDTH, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 170))
+        font_name, size = self.FONT
+        y = self.GRAPH_H + self.PAD * 2
+        for line, color in lines:
+            panel.blit(self.text.render(line, color, size, font_name, cache=False), (self.PAD, y))
+            y += self.LINE
+        return panel
+
+    def _draw_graph(self, screen: pygame.Surface, profiler: FrameProfiler, x0: int, y0: int):
+        w, h = self.WIDTH - self.PAD * 2, self.GRAPH_H
+        scale = h / (self.target_ms * 2)  # потолок графика — два бюджета кадра
+        budget_y = y0 + h - int(self.target_ms * scale)
+        pygame.draw.line(screen, (90, 90, 90), (x0, budget_y), (x0 + w, budget_y))
+        for series, color in ((profiler.frame_ms, (120, 220, 120)), (profiler.work_ms, (255, 200, 80))):
+            values = list(series)[-w:]
+            if len(values) < 2:
+                continue
+            step = w / (len(values) - 1)
+            points = [(x0 + int(i * step), y0 + h - min(h, int(v * scale))) for i, v in enumerate(values)]
+            pygame.draw.lines(screen, color, False, points)
+
+    def draw(self, screen: pygame.Surface, profiler: FrameProfiler, counts: Callable[[], Dict[str, int]]):
+        """counts — считается только при обновлении текста (space.bodies копирует список)."""
+        if self._panel is None or self._age >= self.refresh:
+            self._render_panel(profiler, counts())
+            self._age = 0
+        self._age += 1
+        x = screen.get_width() - self.WIDTH
+        screen.blit(self._panel, (x, 0))
+        self._draw_graph(screen, profiler, x + self.PAD, self.PAD)
@@ -4,10 +4,12 @@ import math
 import random
 import pygame
 import pymunk
+from typing import Dict, Optional, Tuple
 from enums import PickaxeType
+from asset_manager import assets
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, BLOCK_SIZE, BORDER_WIDTH,
-    BOUNCE_GRAVITY
+    BOUNCE_GRAVITY, PICKAXE_ROTATION_STEP, MAX_PICKAXE_SPEED
 )
 
 
@@ -17,6 +19,45 @@ PICKAXES_DIR = os.path.join(ASSETS_DIR, "pickaxes")
 class ThrowPickaxe(Exception):
     pass
 
+
+class RotationCache:
+    """
+    Повернутые версии одной картинки, квантованные по углу с шагом step_deg.
+    Для каждого угла хранится поверхность (rect вызывающий строит по центру
+    сам); маска считается, только если ее кто-то запросил.
+    """
+    def __init__(self, image: pygame.Surface, step_deg: float):
+        self.image = image
+        self.step_deg = step_deg
+        self._slots = max(1, int(round(360.0 / step_deg)))
+        self._frames: Dict[int, pygame.Surface] = {}
+        self._masks: Dict[int, pygame.mask.Mask] = {}
+
+    def key(self, angle_deg: float) -> int:
+        return int(round(angle_deg / self.step_deg)) % self._slots
+
+    def frame(self, key: int) -> pygame.Surface:
+        """Повернутая поверхность для квантованного угла."""
+        surf = self._frames.get(key)
+        if surf is None:
+            surf = pygame.transform.rotate(self.image, key * self.step_deg)
+            self._frames[key] = surf
+        return surf
+
+    def mask(self, key: int) -> pygame.mask.Mask:
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.frame(key))
+            self._masks[key] = mask
+        return mask
+
+    def __len__(self):
+        return len(self._frames)
+
+
+# Кэши поворотов на процесс: (тип кирки, размер, шаг) -> RotationCache
+_ROTATION_CACHES: Dict[Tuple[PickaxeType, str, float], RotationCache] = {}
+
 class Pickaxe(pygame.sprite.Sprite):
     """
     Кирка с физикой Pymunk:
@@ -39,11 +80,14 @@ class Pickaxe(pygame.sprite.Sprite):
         # визуальная часть (картинки)
         self.base_image = self._load_image_for_type(self.type)
         self.original_image = self._make_image_for_size()
-        self.image = self.original_image.copy()
+        # повороты спрайта берутся из кэша (self.mask считается лениво)
+        self.rotation_step = PICKAXE_ROTATION_STEP
+        self._rotations = self._rotation_cache()
+        self._rot_key = 0
+        self.image = self._rotations.frame(0)
         self.rect = self.image.get_rect()
-
-        # маска для коллизий
-        self.mask = pygame.mask.from_surface(self.image)
+        # поза тела до последнего тика (x, y, angle) — для интерполяции отрисовки
+        self._prev_pose: Optional[Tuple[float, float, float]] = None
 
         # параметры «ощущения»
         self.rotation_damping = 0.985
@@ -73,21 +117,19 @@ class Pickaxe(pygame.sprite.Sprite):
         self.active = True
 
     # ---- загрузка/создание спрайта ----
+    @staticmethod
+    def _image_path(pick_type: PickaxeType) -> str:
+        return os.path.join(PICKAXES_DIR, f"pickaxe_{pick_type.name.lower()}.png")
+
     def _load_image_for_type(self, pick_type: PickaxeType):
-        name = pick_type.name.lower()
-        path = os.path.join(PICKAXES_DIR, f"pickaxe_{name}.png")
-        if os.path.exists(path):
-            try:
-                return pygame.image.load(path).convert_alpha()
-            except Exception:
-                return None
-        return None
+        # AssetManager декодирует файл один раз; None — картинки нет
+        return assets.image(self._image_path(pick_type))
 
     def _make_image_for_size(self) -> pygame.Surface:
         w = BLOCK_SIZE if self.size == "small" else int(BLOCK_SIZE * 1.5)
         h = BLOCK_SIZE if self.size == "small" else int(BLOCK_SIZE * 1.5)
         if self.base_image is not None:
-            return pygame.transform.smoothscale(self.base_image, (w, h))
+            return assets.image(self._image_path(self.type), (w, h))
         # fallback — прямоугольник
         surf = pygame.Surface((w, h), pygame.SRCALPHA)
         color = self.type.value["color"]
@@ -95,6 +137,25 @@ class Pickaxe(pygame.sprite.Sprite):
         pygame.draw.rect(surf, (0, 0, 0, 60), (0, 0, w, h), 1)
         return surf
 
+    def _rotation_cache(self) -> RotationCache:
+        key = (self.type, self.size, self.rotation_step)
+        cache = _ROTATION_CACHES.get(key)
+        if cache is None:
+            cache = RotationCache(self.original_image, self.rotation_step)
+            _ROTATION_CACHES[key] = cache
+        return cache
+
+    def set_rotation_step(self, step_deg: float):
+        """Меняет шаг квантования угла (грубее — меньше памяти и поворотов)."""
+        if step_deg != self.rotation_step:
+            self.rotation_step = step_deg
+            self._rotations = self._rotation_cache()
+
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        """Маска текущего (квантованного) поворота — строится только по запросу."""
+        return self._rotations.mask(self._rot_key)
+
     # ---- физика Pymunk ----
     def _clear_physics(self):
         if self.body is not None:
@@ -131,7 +192,9 @@ class Pickaxe(pygame.sprite.Sprite):
         self.size = size
         self.base_image = self._load_image_for_type(self.type)
         self.original_image = self._make_image_for_size()
-        self.image = self.original_image.copy()
+        self._rotations = self._rotation_cache()
+        self._rot_key = 0
+        self.image = self._rotations.frame(0)
         self._clear_physics()
         self._build_physics_body(self.type)
         self.reset_position()
@@ -145,11 +208,56 @@ class Pickaxe(pygame.sprite.Sprite):
             self.body.position = (self.x, self.y)
             self.body.velocity = (0, 0)
             self.body.angular_velocity = 0
-        self.image = self.original_image.copy()
+        self._rot_key = 0
+        self.image = self._rotations.frame(0)
         self._sync_rect_from_state()
+        self._prev_pose = None  # телепорт — между старой и новой позицией не интерполируем
 
-    def can_hit_now(self):
-        now = pygame.time.get_ticks()
+    def set_body_state(self, position, velocity, angle: float, angular_velocity: float,
+                       scroll_y: float = 0.0):
+        """Ставит тело в заданное состояние (восстановление из снимка) и синхронизирует спрайт."""
+        if self.body is None:
+            return
+        self.body.position = position
+        self.body.velocity = velocity
+        self.body.angle = angle
+        self.body.angular_velocity = angular_velocity
+        self.space.reindex_shapes_for_body(self.body)
+        self._rot_key = self._rotations.key(-math.degrees(angle))
+        self.image = self._rotations.frame(self._rot_key)
+        self._sync_rect_from_state(scroll_y)
+        self._prev_pose = None
+
+    def save_pose(self):
+        """Запоминает позу тела перед тиком симуляции (для интерполяции при отрисовке)."""
+        if self.body is not None:
+            x, y = self.body.position
+            self._prev_pose = (x, y, self.body.angle)
+
+    def render_frame(self, scroll_y: float, alpha: float) -> Tuple[pygame.Surface, pygame.Rect]:
+        """
+        Спрайт и экранный rect для отрисовки между предыдущим и текущим тиком
+        (alpha=0 — поза до тика, 1 — текущая).
+        """
+        if alpha >= 1.0 or self._prev_pose is None or self.body is None:
+            return self.image, self.rect
+        ix, iy, angle = self.render_pose(alpha)
+        image = self._rotations.frame(self._rotations.key(-math.degrees(angle)))
+        rect = image.get_rect(center=(int(ix), int(iy - scroll_y)))
+        return image, rect
+
+    def render_pose(self, alpha: float) -> Tuple[float, float, float]:
+        """Мировые (x, y, угол) тела между предыдущим и текущим тиком."""
+        x, y = self.body.position
+        if alpha >= 1.0 or self._prev_pose is None:
+            return x, y, self.body.angle
+        px, py, pa = self._prev_pose
+        return px + (x - px) * alpha, py + (y - py) * alpha, pa + (self.body.angle - pa) * alpha
+
+    def can_hit_now(self, now: float = None):
+        # now — игровое время в мс (Game.time_ms); по умолчанию — реальное время pygame
+        if now is None:
+            now = pygame.time.get_ticks()
         if now - self.last_hit_ts >= self.hit_cooldown_ms:
             self.last_hit_ts = now
             return True
@@ -261,11 +369,15 @@ class Pickaxe(pygame.sprite.Sprite):
             vy = max(vy - 5, -50)  # добавляем небольшое ускорение вверх
 
         self.body.velocity = (vx, vy)
+        # предел скорости: больше — туннелирование сквозь блоки даже с подшагами
+        speed = self.body.velocity.length
+        if speed > MAX_PICKAXE_SPEED:
+            self.body.velocity = self.body.velocity * (MAX_PICKAXE_SPEED / speed)
 
         angle_deg = -math.degrees(self.body.angle)
-        self.image = pygame.transform.rotate(self.original_image, angle_deg)
+        self._rot_key = self._rotations.key(angle_deg)
+        self.image = self._rotations.frame(self._rot_key)
         self._sync_rect_from_state(scroll_y)
-        self.mask = pygame.mask.from_surface(self.image)
 
     def _sync_rect_from_state(self, scroll_y: float = 0.0):
         if not self.body:
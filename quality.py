@@ -0,0 +1,108 @@
+# quality.py
+"""
+Адаптивное качество: по скользящему окну времени кадра снижает дорогие
+визуальные эффекты (частицы, подписи HP, отладочные хитбоксы), когда игра
+не успевает в QUALITY_TARGET_MS, и возвращает их, когда появляется запас.
+
+Меняется только отрисовка: частицы и подписи не участвуют в симуляции,
+поэтому записи сессий воспроизводятся одинаково на любом уровне.
+"""
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from settings import (
+    QUALITY_LEVELS, QUALITY_TARGET_MS, QUALITY_WINDOW_FRAMES,
+    QUALITY_DOWNGRADE_AT, QUALITY_UPGRADE_AT, QUALITY_UPGRADE_WINDOWS,
+)
+
+logger = logging.getLogger(__name__)
+
+Level = Tuple[str, Dict]
+
+
+class QualityController:
+    def __init__(self, game, levels: List[Level] = QUALITY_LEVELS,
+                 target_ms: float = QUALITY_TARGET_MS, window: int = QUALITY_WINDOW_FRAMES,
+                 downgrade_at: float = QUALITY_DOWNGRADE_AT, upgrade_at: float = QUALITY_UPGRADE_AT,
+                 upgrade_windows: int = QUALITY_UPGRADE_WINDOWS):
+        if not levels:
+            raise ValueError("нужен хотя бы один уровень качества")
+        self.game = game
+        self.levels = levels
+        self.target_ms = target_ms
+        self.downgrade_ms = target_ms * downgrade_at
+        self.upgrade_ms = target_ms * upgrade_at
+        self.upgrade_windows = upgrade_windows
+        self._frames: Deque[float] = deque(maxlen=window)
+        self._good_windows = 0
+        self.level = 0
+        self.changes = 0
+        self.last_p90 = 0.0
+        # уровень 0 — то, с чем игра запущена; нижние уровни переопределяют это
+        self._base = self._read()
+
+    @property
+    def name(self) -> str:
+        return self.levels[self.level][0]
+
+    # ======= Параметры игры =======
+
+    def _read(self) -> Dict:
+        game = self.game
+        return {
+            "particle_count": game.particles.particle_count,
+            "particle_life": game.particles.particle_life,
+            "block_labels": game.block_labels.mode,
+            "hitboxes": game.show_hitboxes,
+        }
+
+    def _apply(self, params: Dict):
+        game = self.game
+        game.particles.particle_count = params["particle_count"]
+        game.particles.particle_life = params["particle_life"]
+        if params["block_labels"] != game.block_labels.mode or params["hitboxes"] != game.show_hitboxes:
+            game.block_labels.mode = params["block_labels"]
+            game.show_hitboxes = params["hitboxes"]
+            game.request_full_redraw()
+
+    # ======= Управление =======
+
+    def set_level(self, level: int, reason: str = ""):
+        level = max(0, min(level, len(self.levels) - 1))
+        if level == self.level:
+            return
+        old = self.name
+        self.level = level
+        self._apply({**self._base, **self.levels[level][1]})
+        self.changes += 1
+        self._frames.clear()
+        self._good_windows = 0
+        logger.info("Качество: %s -> %s%s", old, self.name, f" ({reason})" if reason else "")
+
+    def observe(self, frame_ms: float) -> Optional[int]:
+        """
+        Учитывает время очередного кадра (работа без ожидания vsync/лимита FPS).
+        Решение принимается раз в заполненное окно; возвращает новый уровень,
+        если он сменился, иначе None.
+        """
+        frames = self._frames
+        frames.append(frame_ms)
+        if len(frames) < frames.maxlen:
+            return None
+        ordered = sorted(frames)
+        p90 = ordered[int(len(ordered) * 0.9)]
+        self.last_p90 = p90
+        frames.clear()
+
+        if p90 > self.downgrade_ms and self.level < len(self.levels) - 1:
+            self.set_level(self.level + 1, f"p90 {p90:.1f} мс > {self.downgrade_ms:.1f} мс")
+            return self.level
+        if p90 < self.upgrade_ms and self.level > 0:
+            self._good_windows += 1
+            if self._good_windows >= self.upgrade_windows:
+                self.set_level(self.level - 1, f"p90 {p90:.1f} мс < {self.upgrade_ms:.1f} мс")
+                return self.level
+        else:
+            self._good_windows = 0
+        return None
@@ -0,0 +1,185 @@
+# replay.py
+"""
+Запись и воспроизведение сессий.
+
+InputRecorder пишет seed игры и все команды (клавиши и чат) с номером тика,
+на котором они пришли, плюс контрольный хэш состояния в конце. Так как логика
+идет фиксированными тиками, а вся случайность — из seed (Game.rng и производные),
+replay() в headless-режиме на максимальной скорости воспроизводит ту же сессию
+и сверяет хэш.
+
+Формат файла (little-endian):
+    заголовок  "MTCR", версия u8, SIM_HZ u16, подшаги u8, seed u64, тиков u32
+    команды    varint N, затем N строк (varint длина + utf-8)
+    события    u32 M, затем M пар (varint дельта тика, varint индекс команды)
+    хэш        16 байт (blake2b состояния в конце записи)
+
+    python3 main.py --record session.mtcr
+    python3 main.py --replay session.mtcr
+"""
+import hashlib
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from simulation import HeadlessSimulation, SimulationStats
+
+MAGIC = b"MTCR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHBQI")
+
+
+def state_digest(game) -> bytes:
+    """Хэш всего, что должно совпасть при воспроизведении: мир, ресурсы, кирка."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack("<qq", game.ticks, game.blocks_destroyed))
+    h.update(repr(sorted(game.resources.items())).encode())
+    pickaxe = game.pickaxe
+    h.update(f"{pickaxe.type.name}:{pickaxe.size}".encode())
+    body = pickaxe.body
+    if body is not None:
+        h.update(struct.pack("<5d", *body.position, *body.velocity, body.angle))
+    grid = game.block_system.grid
+    h.update(struct.pack("<qq", grid.first_row, grid.end_row))
+    for row in range(grid.first_row, grid.end_row):
+        h.update(grid.row_types(row).tobytes())
+        h.update(grid.row_hp(row).tobytes())
+    return h.digest()
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value, pos
+        shift += 7
+
+
+@dataclass
+class Recording:
+    seed: int
+    sim_hz: int
+    substeps: int
+    end_tick: int
+    events: List[Tuple[int, str]] = field(default_factory=list)  # (тик, команда) по возрастанию тика
+    digest: bytes = b""
+
+    def to_bytes(self) -> bytes:
+        commands: Dict[str, int] = {}
+        for _, cmd in self.events:
+            commands.setdefault(cmd, len(commands))
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.sim_hz, self.substeps, self.seed, self.end_tick))
+        _write_varint(out, len(commands))
+        for cmd in commands:
+            raw = cmd.encode("utf-8")
+            _write_varint(out, len(raw))
+            out += raw
+        out += struct.pack("<I", len(self.events))
+        last = 0
+        for tick, cmd in self.events:
+            _write_varint(out, tick - last)
+            _write_varint(out, commands[cmd])
+            last = tick
+        out += self.digest.ljust(16, b"\0")
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Recording":
+        magic, version, sim_hz, substeps, seed, end_tick = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("это не запись сессии (нет сигнатуры MTCR)")
+        if version != VERSION:
+            raise ValueError(f"неподдерживаемая версия записи: {version}")
+        pos = _HEADER.size
+        n_commands, pos = _read_varint(data, pos)
+        commands = []
+        for _ in range(n_commands):
+            length, pos = _read_varint(data, pos)
+            commands.append(data[pos:pos + length].decode("utf-8"))
+            pos += length
+        (n_events,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        events = []
+        tick = 0
+        for _ in range(n_events):
+            delta, pos = _read_varint(data, pos)
+            tick += delta
+            index, pos = _read_varint(data, pos)
+            events.append((tick, commands[index]))
+        digest = bytes(data[pos:pos + 16])
+        return cls(seed, sim_hz, substeps, end_tick, events, digest)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Подключается к Game и пишет все команды, прошедшие через Game.apply_command."""
+    def __init__(self, game):
+        self.game = game
+        self.events: List[Tuple[int, str]] = []
+        game.recorder = self
+
+    def record(self, tick: int, command: str):
+        self.events.append((tick, command))
+
+    def recording(self) -> Recording:
+        """Запись на текущий момент (с хэшем текущего состояния)."""
+        game = self.game
+        return Recording(seed=game.seed, sim_hz=round(1.0 / game._physics_dt), substeps=game.substeps,
+                         end_tick=game.ticks, events=list(self.events), digest=state_digest(game))
+
+    def save(self, path: str) -> Recording:
+        rec = self.recording()
+        rec.save(path)
+        return rec
+
+
+@dataclass
+class ReplayResult:
+    stats: SimulationStats
+    digest: bytes
+    expected: bytes
+
+    @property
+    def matches(self) -> bool:
+        return not self.expected.strip(b"\0") or self.digest == self.expected
+
+
+def replay(recording: Recording, draw: bool = False) -> ReplayResult:
+    """Прогоняет запись без окна на максимальной скорости."""
+    sim = HeadlessSimulation(draw=draw, seed=recording.seed)
+    game = sim.game
+    game._physics_dt = 1.0 / recording.sim_hz
+    game.substeps = recording.substeps
+
+    events = recording.events
+    i = 0
+    start = time.perf_counter()
+    while True:
+        # команды, пришедшие перед этим тиком
+        while i < len(events) and events[i][0] <= game.ticks:
+            game.apply_command(events[i][1])
+            i += 1
+        if game.ticks >= recording.end_tick:
+            break
+        sim.step()
+    sim.wall_time += time.perf_counter() - start
+    return ReplayResult(stats=sim.stats(), digest=state_digest(game), expected=recording.digest)
@@ -0,0 +1,82 @@
+# scheduler.py
+"""
+Кооперативный планировщик отложенной работы с бюджетом времени на кадр.
+
+Задача — генератор: каждый yield отдает управление, и планировщик решает,
+продолжать ли в этом кадре. Большие задачи (перекраска мира по чат-команде,
+догрузка и сборка текстур) так растягиваются на несколько кадров, а кадр
+тратит на них не больше budget_ms.
+
+Отложенная работа не должна менять симуляцию в зависимости от того, когда
+она выполнится: все, что влияет на физику, либо делается сразу, либо
+досчитывается синхронно перед использованием (см. BlockSystem._stale_views).
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, Optional, Tuple, Union
+
+from settings import FRAME_WORK_BUDGET_MS
+
+Job = Union[Iterator, Callable[[], None]]
+
+
+def _as_iterator(job: Job) -> Iterator:
+    if callable(job) and not hasattr(job, "__next__"):
+        def run_once():
+            job()
+            yield
+        return run_once()
+    return iter(job)
+
+
+class FrameScheduler:
+    def __init__(self, budget_ms: float = FRAME_WORK_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self._jobs: Deque[Tuple[str, Iterator]] = deque()
+        # статистика последнего run() и за все время
+        self.last_ms = 0.0
+        self.last_steps = 0
+        self.jobs_done = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, job: Job, name: str = "job"):
+        """Ставит задачу в конец очереди (генератор или функцию без аргументов)."""
+        self._jobs.append((name, _as_iterator(job)))
+
+    def pending(self):
+        return [name for name, _ in self._jobs]
+
+    def run(self, budget_ms: Optional[float] = None) -> float:
+        """
+        Выполняет шаги задач по очереди, пока не кончится бюджет (хотя бы один
+        шаг за вызов — чтобы очередь двигалась даже на медленном кадре).
+        Возвращает потраченные миллисекунды.
+        """
+        if not self._jobs:
+            self.last_ms = 0.0
+            self.last_steps = 0
+            return 0.0
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        start = time.perf_counter()
+        deadline = start + budget
+        steps = 0
+        while self._jobs:
+            name, it = self._jobs[0]
+            try:
+                next(it)
+            except StopIteration:
+                self._jobs.popleft()
+                self.jobs_done += 1
+            steps += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.last_steps = steps
+        self.last_ms = (time.perf_counter() - start) * 1000.0
+        return self.last_ms
+
+    def flush(self):
+        """Доделывает все задачи сразу (например, перед сохранением)."""
+        while self._jobs:
+            self.run(float("inf"))
@@ -10,12 +10,65 @@ GRID_VISIBLE_ROWS = 13
 SCREEN_WIDTH = GRID_COLS * BLOCK_SIZE + 2 * BORDER_WIDTH
 SCREEN_HEIGHT = GRID_VISIBLE_ROWS * BLOCK_SIZE
 
+# --- Отрисовка ---
+DIRTY_RECTS = False          # показывать только измененные области (display.update(rects)) вместо flip()
+RENDER_FPS_LIMIT = 144       # ограничение частоты кадров отрисовки (0 — без ограничения)
+DEBUG_HITBOXES = True        # рисовать контуры физических форм кирки и блоков
+PERF_HISTORY_FRAMES = 240        # сколько кадров держит оверлей производительности (F3) для графика
+PERF_OVERLAY_REFRESH_FRAMES = 15 # как часто обновлять цифры оверлея, кадров
+
+# --- Адаптивное качество (quality.py) ---
+# Контроллер следит за временем кадра (без сна в clock.tick) и при отставании
+# от цели снижает уровень, при запасе — возвращает. Гистерезис: порог снижения
+# выше цели, порог повышения заметно ниже, и повышаться можно только после
+# нескольких подряд "легких" окон.
+QUALITY_ADAPTIVE = True
+QUALITY_TARGET_MS = 1000.0 / 60  # цель — 60 FPS
+QUALITY_WINDOW_FRAMES = 90       # окно скользящей статистики (p90 времени кадра)
+QUALITY_DOWNGRADE_AT = 1.0       # снижать, если p90 окна > цель * это
+QUALITY_UPGRADE_AT = 0.6         # повышать, если p90 окна < цель * это ...
+QUALITY_UPGRADE_WINDOWS = 3      # ... столько окон подряд
+# Уровни ниже исходного: что переопределить. Уровень 0 — настройки, с которыми игра запущена.
+# Шаг поворота кирки здесь не меняется: от него зависит ширина rect, по которой
+# кирка упирается в стены, — это повлияло бы на физику и воспроизведение записей.
+QUALITY_LEVELS = [
+    ("high", {}),
+    ("medium", {"particle_count": 8, "particle_life": 20, "block_labels": "damaged", "hitboxes": False}),
+    ("low", {"particle_count": 4, "particle_life": 12, "block_labels": "off", "hitboxes": False}),
+]
+
+# --- Шаг симуляции ---
+SIM_HZ = 60                  # частота фиксированного тика игровой логики (не зависит от FPS отрисовки)
+PHYSICS_SUBSTEPS = 2         # шагов pymunk на тик: меньше шаг — нет туннелирования на больших скоростях
+MAX_CATCHUP_TICKS = 5        # максимум тиков за кадр после подвисания; остальное отставание отбрасывается
+FRAME_WORK_BUDGET_MS = 2.0   # сколько мс за кадр можно тратить на отложенную работу (scheduler.py)
+
+# --- Сохранение ---
+SNAPSHOT_AUTOSAVE_SECONDS = 30  # как часто (реальное время) сохранять снимок при запуске с --save
+
 # --- Генерация/скролл ---
 INITIAL_SPAWN_ROWS = 40
 INITIAL_OFFSET = 5 * BLOCK_SIZE
 SCROLL_THRESHOLD_HEIGHT = INITIAL_OFFSET + BLOCK_SIZE
 SCROLL_SMOOTH_FRAMES = 10
 
+# --- Модель мира ---
+WORLD_CHUNK_ROWS = 32        # строк в одном чанке сетки мира (world_grid.py)
+VIEW_MARGIN_ROWS = 2         # спрайты блоков создаются для видимых строк ± этот запас (и вокруг кирки)
+PHYSICS_ACTIVE_ROWS = 3      # статические формы pymunk есть только у строк кирки ± этот запас
+ROW_RETENTION_ABOVE = 2 * GRID_VISIBLE_ROWS  # сколько строк выше камеры/кирки хранить, остальное выбрасывается
+RENDER_CHUNK_ROWS = 4        # строк в одной кэшированной полосе отрисовки
+
+WORLD_PREFETCH_CHUNKS = 2    # сколько чанков мира вперед генерирует фоновый поток (0 — выключено)
+
+# Распределение руд по глубине (world_gen.py): (с какой строки, множители spawn_chance по типам).
+# Полоса действует до начала следующей; типы, которых нет в словаре, — с множителем 1.
+ORE_DEPTH_BANDS = [
+    (0,   {}),
+    (60,  {"COAL": 0.7, "OBSIDIAN": 1.5, "DIAMOND": 1.5, "LAPIS": 1.3}),
+    (150, {"COAL": 0.4, "COPPER": 0.7, "OBSIDIAN": 2.5, "DIAMOND": 2.5, "EMERALD": 2.0, "LAPIS": 1.5}),
+]
+
 # --- Физика кирки ---
 BOUNCE_STRENGTH = -3
 BOUNCE_GRAVITY = 0.5
@@ -27,10 +80,21 @@ BOUNCE_SIDE_IMPULSE = 10
 PICKAXE_ROTATE_FROM_VY = 8.0   # чем больше — тем сильнее влияет вертикальная скорость на угол
 PICKAXE_TILT_FROM_VX = 2.2     # влияет горизонтальная скорость
 PICKAXE_MAX_ANGLE = 35         # ограничение на итоговый угол в градусах
+PICKAXE_ROTATION_STEP = 2.0    # шаг квантования угла для кэша повернутых спрайтов, градусы
 MAX_PICKAXE_SPEED = 1000
+# --- Частицы ---
+PARTICLE_CAPACITY = 4096       # емкость кольцевого буфера; при переполнении перезаписываются самые старые
+PARTICLE_GRAVITY = 0.2         # px/кадр² — ускорение частиц вниз
+PARTICLE_ALPHA_BUCKETS = 16    # сколько градаций прозрачности пререндерится на цвет
+
 # --- HP блоков ---
 BLOCK_HP_PER_HARDNESS = 5
 BLOCK_HP_THRESHOLDS = [100, 80, 60, 40, 20, 0]
+BLOCK_LABEL_MODE = "all"     # HP над блоками: "all", "damaged" (только поврежденные), "off"
+
+# --- Загрузка ассетов ---
+ASSET_LOADER_WORKERS = 4         # потоков для параллельного декодирования PNG
+ASSET_LAZY_SPAWN_CHANCE = 0.01   # текстуры блоков реже этого шанса грузятся при первом появлении
 
 # --- Пути к ассетам (необязательны) ---
 # Папки
@@ -39,6 +103,10 @@ ASSETS_ROOT = os.path.join(BASE_DIR, "assets")
 PICKAXES_DIR = os.path.join(ASSETS_ROOT, "pickaxes")
 BLOCKS_DIR = os.path.join(ASSETS_ROOT, "blocks")
 
+# Предсобранный пакет ассетов (python -m asset_pack); нет или устарел — грузятся PNG
+ASSET_PACK_ENABLED = True
+ASSET_PACK_DIR = os.path.join(ASSETS_ROOT, "pack")
+
 # Имена файлов для кирок — можно не создавать, будет фоллбэк
 PICKAXE_IMAGE_FILES = {
     "WOOD":      "pickaxe_wood.png",
@@ -0,0 +1,137 @@
+# simulation.py
+"""
+Headless-режим: Game без окна, без display.set_mode() и без clock.tick(60).
+Кадры шагаются так быстро, как позволяет CPU; отрисовка опциональна
+(во внеэкранную поверхность).
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import pygame
+
+from game import Game
+from settings import BLOCK_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+@dataclass
+class SimulationStats:
+    """Итоги прогона."""
+    frames: int
+    wall_time: float                       # секунды, весь прогон
+    blocks_destroyed: int
+    resources: Dict[str, int]
+    max_depth: int                         # самая глубокая строка (в блоках), которой достигла кирка
+    update_times: List[float] = field(default_factory=list)  # секунды на Game.update() по кадрам
+    draw_times: List[float] = field(default_factory=list)    # секунды на Game.draw() по кадрам (если рисовали)
+    world_rows: int = 0                    # строк в сетке мира на конец прогона
+    sprites: int = 0                       # спрайтов блоков на конец прогона
+    space_shapes: int = 0                  # форм в пространстве pymunk на конец прогона
+
+    @property
+    def frame_times(self) -> List[float]:
+        if not self.draw_times:
+            return list(self.update_times)
+        return [u + d for u, d in zip(self.update_times, self.draw_times)]
+
+    @property
+    def mean_frame_ms(self) -> float:
+        times = self.frame_times
+        return (sum(times) / len(times)) * 1000.0 if times else 0.0
+
+    @property
+    def max_frame_ms(self) -> float:
+        return max(self.frame_times, default=0.0) * 1000.0
+
+    def summary(self) -> str:
+        fps = self.frames / self.wall_time if self.wall_time > 0 else 0.0
+        res = ", ".join(f"{k}={v}" for k, v in self.resources.items())
+        return (
+            f"Кадров: {self.frames} за {self.wall_time:.2f} с ({fps:.0f} кадр/с)\n"
+            f"Время кадра: среднее {self.mean_frame_ms:.3f} мс, максимум {self.max_frame_ms:.3f} мс\n"
+            f"Разрушено блоков: {self.blocks_destroyed}, глубина: {self.max_depth}\n"
+            f"Ресурсы: {res}\n"
+            f"Мир: строк {self.world_rows}, спрайтов {self.sprites}, форм pymunk {self.space_shapes}"
+        )
+
+
+class HeadlessSimulation:
+    """
+    Обертка над Game для прогона без окна.
+
+    draw=True — после каждого update() вызывается Game.draw() во внеэкранную
+    поверхность (замеряется отдельно).
+    """
+    def __init__(self, draw: bool = False, seed: Optional[int] = None):
+        self.draw = draw
+        self.surface: Optional[pygame.Surface] = None
+        if draw:
+            pygame.font.init()
+            self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.game = Game(self.surface, seed=seed)
+
+        self.frames = 0
+        self.wall_time = 0.0
+        self.max_depth = self._depth()
+        self.update_times: List[float] = []
+        self.draw_times: List[float] = []
+
+    def _depth(self) -> int:
+        body = self.game.pickaxe.body
+        return int(body.position.y // BLOCK_SIZE) if body is not None else 0
+
+    def step(self):
+        """Один кадр: update() и (опционально) draw()."""
+        t0 = time.perf_counter()
+        self.game.update()
+        self.game.scheduler.run()
+        t1 = time.perf_counter()
+        self.update_times.append(t1 - t0)
+        if self.draw:
+            self.game.draw(self.surface)
+            self.draw_times.append(time.perf_counter() - t1)
+        self.frames += 1
+        self.max_depth = max(self.max_depth, self._depth())
+
+    def run(self, frames: Optional[int] = None, seconds: Optional[float] = None,
+            on_frame: Optional[Callable[["HeadlessSimulation"], None]] = None) -> SimulationStats:
+        """
+        Шагает до исчерпания frames кадров или seconds секунд реального времени
+        (что наступит раньше). on_frame вызывается перед каждым кадром.
+        """
+        if frames is None and seconds is None:
+            raise ValueError("нужно задать frames и/или seconds")
+
+        start = time.perf_counter()
+        deadline = start + seconds if seconds is not None else None
+        done = 0
+        while frames is None or done < frames:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if on_frame is not None:
+                on_frame(self)
+            self.step()
+            done += 1
+        self.wall_time += time.perf_counter() - start
+        return self.stats()
+
+    def stats(self) -> SimulationStats:
+        """Сводка за все кадры этой сессии (в т.ч. за несколько вызовов run())."""
+        return SimulationStats(
+            frames=self.frames,
+            wall_time=self.wall_time,
+            blocks_destroyed=self.game.blocks_destroyed,
+            resources=dict(self.game.resources),
+            max_depth=self.max_depth,
+            update_times=list(self.update_times),
+            draw_times=list(self.draw_times),
+            world_rows=len(self.game.block_system.grid),
+            sprites=len(self.game.block_system.block_sprites),
+            space_shapes=len(self.game.space.shapes),
+        )
+
+
+def run_headless(frames: Optional[int] = None, seconds: Optional[float] = None,
+                 draw: bool = False, seed: Optional[int] = None) -> SimulationStats:
+    """Прогоняет новую сессию без окна и возвращает сводку."""
+    return HeadlessSimulation(draw=draw, seed=seed).run(frames=frames, seconds=seconds)
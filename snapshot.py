@@ -0,0 +1,237 @@
+# snapshot.py
+"""
+Снимок игры в компактном бинарном виде: сетка мира (тип + HP клеток),
+ресурсы и счетчики, кирка (тип, размер, состояние тела), камера и состояние
+генераторов случайности (мир дальше генерируется тот же). Накопленные pymunk
+импульсы контактов не сохраняются — траектория кирки после восстановления
+может немного отличаться от непрерывной игры.
+
+Восстановление не генерирует мир заново: сетка собирается из массивов
+целиком, спрайты и формы pymunk создаются только для строк у экрана/кирки
+(одним space.add).
+
+Формат (little-endian): заголовок "MTCS" + версия, затем zlib-сжатое тело
+(поля — в порядке _write_body).
+
+    from snapshot import save_snapshot, load_snapshot
+    save_snapshot(game, "save.mtcs")
+    game = load_snapshot("save.mtcs", screen)
+"""
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from enums import PickaxeType
+from world_grid import WorldGrid
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MTCS"
+VERSION = 1
+PICKAXE_SIZES = ("small", "large")
+PICKAXE_TYPES = tuple(PickaxeType)
+
+_HEADER = struct.Struct("<4sB")
+# seed, тики, время, разрушено блоков, скролл, цель скролла, кадров доскролла
+_GAME = struct.Struct("<QqdqddI")
+# тип, размер, активна, x, y, vx, vy, угол, угл. скорость, последний удар (мс), его Y
+_PICKAXE = struct.Struct("<BBB8d")
+# первая строка, строк, колонок
+_GRID = struct.Struct("<qII")
+_MT_WORDS = 625  # размер состояния random.Random (Mersenne Twister)
+
+
+def _pack_rng_state(state) -> bytes:
+    version, words, gauss = state
+    has_gauss = gauss is not None
+    return struct.pack(f"<B{_MT_WORDS}IBd", version, *words, has_gauss, gauss if has_gauss else 0.0)
+
+
+def _unpack_rng_state(data: bytes, pos: int):
+    fmt = f"<B{_MT_WORDS}IBd"
+    values = struct.unpack_from(fmt, data, pos)
+    version, words, has_gauss, gauss = values[0], values[1:1 + _MT_WORDS], values[-2], values[-1]
+    return (version, tuple(words), gauss if has_gauss else None), pos + struct.calcsize(fmt)
+
+
+@dataclass
+class Snapshot:
+    seed: int
+    ticks: int
+    time_ms: float
+    blocks_destroyed: int
+    scroll_y: float
+    scroll_target: float
+    scroll_frames_left: int
+    pickaxe_type: PickaxeType
+    pickaxe_size: str
+    pickaxe_active: bool
+    body_position: Tuple[float, float]
+    body_velocity: Tuple[float, float]
+    body_angle: float
+    body_angular_velocity: float
+    last_hit_ts: float
+    last_hit_y: float
+    resources: Dict[str, int]
+    first_row: int
+    types: np.ndarray  # (строк, cols) uint8
+    hp: np.ndarray     # (строк, cols) int16
+    rng_state: tuple = field(default=None)
+    world_rng_state: tuple = field(default=None)
+
+    # ======= Снятие / применение =======
+
+    @classmethod
+    def capture(cls, game) -> "Snapshot":
+        p = game.pickaxe
+        body = p.body
+        grid = game.block_system.grid
+        types, hp = grid.to_arrays()
+        return cls(
+            seed=game.seed, ticks=game.ticks, time_ms=game.time_ms,
+            blocks_destroyed=game.blocks_destroyed, scroll_y=game.scroll_y,
+            scroll_target=game.scroll_target, scroll_frames_left=game.scroll_frames_left,
+            pickaxe_type=p.type, pickaxe_size=p.size, pickaxe_active=p.active,
+            body_position=tuple(body.position) if body else (p.x, p.y),
+            body_velocity=tuple(body.velocity) if body else (0.0, 0.0),
+            body_angle=body.angle if body else 0.0,
+            body_angular_velocity=body.angular_velocity if body else 0.0,
+            last_hit_ts=float(p.last_hit_ts), last_hit_y=float(p.last_hit_y),
+            resources=dict(game.resources), first_row=grid.first_row, types=types, hp=hp,
+            rng_state=game.rng.getstate(), world_rng_state=game.block_system.rng.getstate(),
+        )
+
+    def world_grid(self) -> WorldGrid:
+        return WorldGrid.from_arrays(self.first_row, self.types, self.hp)
+
+    def apply(self, game):
+        """Переносит в только что созданную Game(snapshot=...) все, кроме сетки мира."""
+        game.ticks = self.ticks
+        game.time_ms = self.time_ms
+        game.blocks_destroyed = self.blocks_destroyed
+        game.resources.update(self.resources)
+        game.scroll_y = game._prev_scroll_y = self.scroll_y
+        game.scroll_target = self.scroll_target
+        game.scroll_frames_left = self.scroll_frames_left
+        if self.rng_state is not None:
+            game.rng.setstate(self.rng_state)
+        if self.world_rng_state is not None:
+            game.block_system.rng.setstate(self.world_rng_state)
+
+        p = game.pickaxe
+        p.activate(self.pickaxe_type, self.pickaxe_size)
+        p.active = self.pickaxe_active
+        p.set_body_state(self.body_position, self.body_velocity, self.body_angle,
+                         self.body_angular_velocity, self.scroll_y)
+        p.last_hit_ts = self.last_hit_ts
+        p.last_hit_y = self.last_hit_y
+        game.block_system.update(game.scroll_y, p.body.position.y if p.body is not None else None)
+
+    # ======= Сериализация =======
+
+    def to_bytes(self) -> bytes:
+        body = bytearray()
+        body += _GAME.pack(self.seed, self.ticks, self.time_ms, self.blocks_destroyed,
+                           self.scroll_y, self.scroll_target, self.scroll_frames_left)
+        body += _PICKAXE.pack(PICKAXE_TYPES.index(self.pickaxe_type), PICKAXE_SIZES.index(self.pickaxe_size),
+                              self.pickaxe_active, *self.body_position, *self.body_velocity,
+                              self.body_angle, self.body_angular_velocity, self.last_hit_ts, self.last_hit_y)
+        body.append(len(self.resources))
+        for name, value in self.resources.items():
+            raw = name.encode("utf-8")
+            body.append(len(raw))
+            body += raw
+            body += struct.pack("<q", value)
+        body.append(self.rng_state is not None and self.world_rng_state is not None)
+        if self.rng_state is not None and self.world_rng_state is not None:
+            body += _pack_rng_state(self.rng_state)
+            body += _pack_rng_state(self.world_rng_state)
+        rows, cols = self.types.shape
+        body += _GRID.pack(self.first_row, rows, cols)
+        body += np.ascontiguousarray(self.types, dtype=np.uint8).tobytes()
+        body += np.ascontiguousarray(self.hp, dtype="<i2").tobytes()
+        return _HEADER.pack(MAGIC, VERSION) + zlib.compress(bytes(body), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("это не снимок игры (нет сигнатуры MTCS)")
+        if version != VERSION:
+            raise ValueError(f"неподдерживаемая версия снимка: {version}")
+        body = zlib.decompress(data[_HEADER.size:])
+
+        seed, ticks, time_ms, destroyed, scroll_y, scroll_target, frames_left = _GAME.unpack_from(body, 0)
+        pos = _GAME.size
+        (ptype, psize, active, x, y, vx, vy, angle, ang_vel,
+         last_hit_ts, last_hit_y) = _PICKAXE.unpack_from(body, pos)
+        pos += _PICKAXE.size
+
+        resources = {}
+        count = body[pos]
+        pos += 1
+        for _ in range(count):
+            length = body[pos]
+            name = body[pos + 1:pos + 1 + length].decode("utf-8")
+            pos += 1 + length
+            (resources[name],) = struct.unpack_from("<q", body, pos)
+            pos += 8
+
+        rng_state = world_rng_state = None
+        has_rng = body[pos]
+        pos += 1
+        if has_rng:
+            rng_state, pos = _unpack_rng_state(body, pos)
+            world_rng_state, pos = _unpack_rng_state(body, pos)
+
+        first_row, rows, cols = _GRID.unpack_from(body, pos)
+        pos += _GRID.size
+        n = rows * cols
+        types = np.frombuffer(body, dtype=np.uint8, count=n, offset=pos).reshape(rows, cols)
+        hp = np.frombuffer(body, dtype="<i2", count=n, offset=pos + n).reshape(rows, cols).astype(np.int16)
+
+        return cls(
+            seed=seed, ticks=ticks, time_ms=time_ms, blocks_destroyed=destroyed,
+            scroll_y=scroll_y, scroll_target=scroll_target, scroll_frames_left=frames_left,
+            pickaxe_type=PICKAXE_TYPES[ptype], pickaxe_size=PICKAXE_SIZES[psize], pickaxe_active=bool(active),
+            body_position=(x, y), body_velocity=(vx, vy), body_angle=angle, body_angular_velocity=ang_vel,
+            last_hit_ts=last_hit_ts, last_hit_y=last_hit_y, resources=resources,
+            first_row=first_row, types=types, hp=hp,
+            rng_state=rng_state, world_rng_state=world_rng_state,
+        )
+
+
+def save_snapshot(game, path: str) -> int:
+    """Пишет снимок атомарно (через временный файл); возвращает размер в байтах."""
+    data = Snapshot.capture(game).to_bytes()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    logger.info("Снимок сохранен: %s (%d байт)", path, len(data))
+    return len(data)
+
+
+def load_snapshot(path: str, screen=None, **game_kwargs):
+    """Новая Game, продолжающая игру из снимка."""
+    from game import Game
+
+    with open(path, "rb") as f:
+        snap = Snapshot.from_bytes(f.read())
+    return Game(screen, snapshot=snap, **game_kwargs)
+
+
+def try_load_snapshot(path: str, screen=None, **game_kwargs) -> Optional["object"]:
+    """load_snapshot, но None (с предупреждением в логе), если файла нет или он поврежден."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return load_snapshot(path, screen, **game_kwargs)
+    except (OSError, ValueError, zlib.error, struct.error) as e:
+        logger.warning("Снимок %s не загружен: %s", path, e)
+        return None
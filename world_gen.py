@@ -0,0 +1,172 @@
+# world_gen.py
+"""
+Генерация мира целыми чанками: тип каждой клетки выбирается по
+кумулятивной таблице весов (spawn_chance с множителями полосы глубины,
+ORE_DEPTH_BANDS) одним np.searchsorted на весь чанк.
+
+Чанк зависит только от (seed, номер чанка) — мир воспроизводим по seed,
+а чанки можно генерировать в любом порядке. Поэтому следующие чанки
+(WORLD_PREFETCH_CHUNKS) генерируются заранее в фоновом потоке, а главный
+поток только забирает готовые массивы; результат тот же, что и без потока.
+"""
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, List, Mapping, Sequence, Set, Tuple
+
+import numpy as np
+
+from enums import BlockType
+from settings import GRID_COLS, WORLD_CHUNK_ROWS, ORE_DEPTH_BANDS, WORLD_PREFETCH_CHUNKS
+from world_grid import BLOCK_TYPES, TYPE_IDS
+
+logger = logging.getLogger(__name__)
+
+Band = Tuple[int, Mapping[str, float]]
+
+
+class _BackgroundWorker:
+    """Один фоновый поток на процесс: выполняет заказанные задачи генерации по очереди."""
+    def __init__(self):
+        self._queue: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[], None]):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="world-gen", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                job()
+            except Exception:
+                logger.exception("Фоновая генерация чанка не удалась")
+
+
+_WORKER = _BackgroundWorker()
+
+
+def cumulative_weights(multipliers: Mapping[str, float]) -> np.ndarray:
+    """Нормированная кумулятивная таблица весов по BLOCK_TYPES (последний элемент — 1.0)."""
+    weights = np.array([bt.value["spawn_chance"] * multipliers.get(bt.name, 1.0) for bt in BLOCK_TYPES],
+                       dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        raise ValueError("сумма весов генерации должна быть положительной")
+    cum = np.cumsum(weights / total)
+    cum[-1] = 1.0
+    return cum
+
+
+class WorldGenerator:
+    """
+    Источник типов клеток: chunk(i) — массив id типов (chunk_rows, cols) для
+    строк [i*chunk_rows, (i+1)*chunk_rows). Последние чанки кэшируются.
+    """
+    def __init__(self, seed: int, bands: Sequence[Band] = ORE_DEPTH_BANDS,
+                 cols: int = GRID_COLS, chunk_rows: int = WORLD_CHUNK_ROWS, cache_chunks: int = 4,
+                 prefetch_chunks: int = WORLD_PREFETCH_CHUNKS):
+        self.seed = seed
+        self.cols = cols
+        self.chunk_rows = chunk_rows
+        self.cache_chunks = max(cache_chunks, prefetch_chunks + 1)
+        self.prefetch_chunks = prefetch_chunks
+        # готовые чанки из фонового потока (пишет поток, забирает chunk())
+        self._ready: Dict[int, np.ndarray] = {}
+        self._pending: Set[int] = set()
+        self._ready_lock = threading.Lock()
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        bands = sorted(bands or [(0, {})], key=lambda b: b[0])
+        for _, multipliers in bands:
+            unknown = set(multipliers) - set(BlockType.__members__)
+            if unknown:
+                raise ValueError(f"неизвестные типы блоков в ORE_DEPTH_BANDS: {', '.join(sorted(unknown))}")
+        self.band_starts = np.array([start for start, _ in bands], dtype=np.int64)
+        self.tables: List[np.ndarray] = [cumulative_weights(m) for _, m in bands]
+        # индекс в BLOCK_TYPES -> id типа в сетке
+        self._ids = np.array([TYPE_IDS[bt] for bt in BLOCK_TYPES], dtype=np.uint8)
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def band_of(self, row: int) -> int:
+        return max(0, int(np.searchsorted(self.band_starts, row, side="right")) - 1)
+
+    def generate_chunk(self, index: int) -> np.ndarray:
+        """Чанк без кэша (детерминирован по seed и index)."""
+        rng = np.random.default_rng([self.seed, index])
+        u = rng.random((self.chunk_rows, self.cols))
+        first = index * self.chunk_rows
+        rows = np.arange(first, first + self.chunk_rows)
+        bands = np.maximum(np.searchsorted(self.band_starts, rows, side="right") - 1, 0)
+        out = np.empty((self.chunk_rows, self.cols), dtype=np.uint8)
+        for band in np.unique(bands):
+            sel = bands == band
+            picks = np.searchsorted(self.tables[band], u[sel], side="right")
+            out[sel] = self._ids[np.minimum(picks, len(self._ids) - 1)]
+        return out
+
+    # ======= Фоновая генерация =======
+
+    def _fill(self, index: int):
+        """Выполняется в фоновом потоке."""
+        arr = self.generate_chunk(index)
+        with self._ready_lock:
+            self._pending.discard(index)
+            self._ready[index] = arr
+
+    def prefetch(self, index: int):
+        """Заказывает чанк фоновому потоку (если его еще нет и он не заказан)."""
+        with self._ready_lock:
+            if index in self._pending or index in self._ready or index in self._cache:
+                return
+            self._pending.add(index)
+        _WORKER.submit(partial(self._fill, index))
+
+    def _take_ready(self, index: int):
+        with self._ready_lock:
+            arr = self._ready.pop(index, None)
+            # чанки выше запрошенного уже не понадобятся
+            for stale in [i for i in self._ready if i < index]:
+                del self._ready[stale]
+        return arr
+
+    # ======= Доступ =======
+
+    def chunk(self, index: int) -> np.ndarray:
+        arr = self._cache.get(index)
+        if arr is not None:
+            self._cache.move_to_end(index)
+            return arr
+
+        arr = self._take_ready(index) if self.prefetch_chunks else None
+        if arr is not None:
+            self.prefetch_hits += 1
+        else:
+            # не успели (или поток выключен) — генерируем синхронно, результат тот же
+            arr = self.generate_chunk(index)
+            if self.prefetch_chunks:
+                self.prefetch_misses += 1
+        self._cache[index] = arr
+        if len(self._cache) > self.cache_chunks:
+            self._cache.popitem(last=False)
+        for ahead in range(index + 1, index + 1 + self.prefetch_chunks):
+            self.prefetch(ahead)
+        return arr
+
+    def row(self, row: int) -> np.ndarray:
+        """Id типов строки (представление внутри кэшированного чанка — не изменять)."""
+        index, local = divmod(row, self.chunk_rows)
+        return self.chunk(index)[local]
+
+    def distribution(self, row: int) -> Dict[BlockType, float]:
+        """Вероятности типов на строке (для отладки/баланса)."""
+        cum = self.tables[self.band_of(row)]
+        probs = np.diff(np.concatenate(([0.0], cum)))
+        return {bt: float(p) for bt, p in zip(BLOCK_TYPES, probs)}
@@ -0,0 +1,180 @@
+# world_grid.py
+"""
+Компактная модель мира: для каждой клетки хранится только id типа (uint8)
+и HP (int16) — 3 байта вместо спрайта с поверхностью, маской и телом pymunk.
+Строки лежат чанками по WORLD_CHUNK_ROWS строк в NumPy-массивах.
+
+Спрайты Block создаются BlockSystem только для строк рядом с экраном/киркой
+и пишут изменения HP обратно в сетку.
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from enums import BlockType
+from settings import (
+    BLOCK_SIZE, GRID_COLS, INITIAL_OFFSET, BLOCK_HP_PER_HARDNESS, WORLD_CHUNK_ROWS
+)
+
+# id типа: 0 — пустая клетка, остальные — индекс в BLOCK_TYPES + 1
+EMPTY = 0
+BLOCK_TYPES = tuple(BlockType)
+TYPE_IDS: Dict[BlockType, int] = {bt: i + 1 for i, bt in enumerate(BLOCK_TYPES)}
+
+
+def type_of(type_id: int) -> Optional[BlockType]:
+    return BLOCK_TYPES[type_id - 1] if type_id != EMPTY else None
+
+
+def max_hp_of(bt: BlockType) -> int:
+    return max(1, bt.value["hardness"] * BLOCK_HP_PER_HARDNESS)
+
+
+def row_world_y(row: int) -> int:
+    """Мировая Y верхнего края строки."""
+    return INITIAL_OFFSET + row * BLOCK_SIZE
+
+
+def row_at(world_y: float) -> int:
+    """Индекс строки, в которую попадает мировая Y."""
+    return int((world_y - INITIAL_OFFSET) // BLOCK_SIZE)
+
+
+class WorldGrid:
+    """Сетка мира: строки [first_row, end_row), по cols клеток в строке."""
+    def __init__(self, cols: int = GRID_COLS, chunk_rows: int = WORLD_CHUNK_ROWS):
+        self.cols = cols
+        self.chunk_rows = chunk_rows
+        self.first_row = 0
+        self.end_row = 0
+        self._types: Dict[int, np.ndarray] = {}
+        self._hp: Dict[int, np.ndarray] = {}
+        # строки, чья картинка изменилась (тип, стадия повреждения, разрушение, новая строка)
+        self.dirty_rows: Set[int] = set()
+        # HP по id типа (считается при создании — hardness можно менять перед запуском)
+        self.max_hp = np.array([0] + [max_hp_of(bt) for bt in BLOCK_TYPES], dtype=np.int16)
+
+    def __len__(self) -> int:
+        return self.end_row - self.first_row
+
+    def __contains__(self, row: int) -> bool:
+        return self.first_row <= row < self.end_row
+
+    # ======= Доступ =======
+
+    def _locate(self, row: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        if row not in self:
+            raise IndexError(f"строка {row} вне сетки [{self.first_row}, {self.end_row})")
+        chunk, local = divmod(row, self.chunk_rows)
+        return self._types[chunk], self._hp[chunk], local
+
+    def row_types(self, row: int) -> np.ndarray:
+        types, _, local = self._locate(row)
+        return types[local]
+
+    def row_hp(self, row: int) -> np.ndarray:
+        _, hp, local = self._locate(row)
+        return hp[local]
+
+    def cell(self, row: int, col: int) -> Tuple[int, int]:
+        """(id типа, HP) клетки."""
+        types, hp, local = self._locate(row)
+        return int(types[local, col]), int(hp[local, col])
+
+    def set_hp(self, row: int, col: int, value: int) -> None:
+        _, hp, local = self._locate(row)
+        hp[local, col] = max(0, value)
+        if value <= 0:
+            self.dirty_rows.add(row)
+
+    def set_type(self, row: int, col: int, type_id: int) -> None:
+        """Меняет тип клетки с полным восстановлением HP."""
+        types, hp, local = self._locate(row)
+        types[local, col] = type_id
+        hp[local, col] = self.max_hp[type_id]
+        self.dirty_rows.add(row)
+
+    def mark_dirty(self, row: int) -> None:
+        """Картинка строки изменилась без смены типа (например, новая стадия повреждения)."""
+        self.dirty_rows.add(row)
+
+    def pop_dirty_rows(self) -> Set[int]:
+        rows, self.dirty_rows = self.dirty_rows, set()
+        return rows
+
+    def alive(self, row: int, col: int) -> bool:
+        return self.cell(row, col)[1] > 0
+
+    # ======= Рост =======
+
+    def append_row(self, type_ids: Iterable[int]) -> int:
+        """Добавляет строку снизу; возвращает ее индекс."""
+        row = self.end_row
+        chunk, local = divmod(row, self.chunk_rows)
+        if chunk not in self._types:
+            self._types[chunk] = np.zeros((self.chunk_rows, self.cols), dtype=np.uint8)
+            self._hp[chunk] = np.zeros((self.chunk_rows, self.cols), dtype=np.int16)
+        if isinstance(type_ids, np.ndarray):
+            ids = type_ids.astype(np.uint8, copy=False)
+        else:
+            ids = np.fromiter(type_ids, dtype=np.uint8, count=self.cols)
+        self._types[chunk][local] = ids
+        self._hp[chunk][local] = self.max_hp[ids]
+        self.end_row = row + 1
+        self.dirty_rows.add(row)
+        return row
+
+    def drop_rows_before(self, row: int) -> int:
+        """
+        Выбрасывает строки выше row (first_row становится row); полностью
+        освободившиеся чанки удаляются. Возвращает число выброшенных строк.
+        """
+        row = min(row, self.end_row)
+        if row <= self.first_row:
+            return 0
+        dropped = row - self.first_row
+        self.first_row = row
+        self.dirty_rows = {r for r in self.dirty_rows if r >= row}
+        for chunk in [c for c in self._types if (c + 1) * self.chunk_rows <= row]:
+            del self._types[chunk]
+            del self._hp[chunk]
+        return dropped
+
+    # ======= Снимки =======
+
+    def _chunk_slices(self) -> Iterable[Tuple[int, slice, slice]]:
+        """(чанк, срез в чанке, срез в общем массиве строк [first_row, end_row))."""
+        cr = self.chunk_rows
+        for chunk in range(self.first_row // cr, (self.end_row - 1) // cr + 1) if len(self) else ():
+            lo = max(chunk * cr, self.first_row)
+            hi = min((chunk + 1) * cr, self.end_row)
+            yield chunk, slice(lo - chunk * cr, hi - chunk * cr), slice(lo - self.first_row, hi - self.first_row)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Все строки одним куском: (типы, HP) формы (строк, cols)."""
+        types = np.empty((len(self), self.cols), dtype=np.uint8)
+        hp = np.empty((len(self), self.cols), dtype=np.int16)
+        for chunk, src, dst in self._chunk_slices():
+            types[dst] = self._types[chunk][src]
+            hp[dst] = self._hp[chunk][src]
+        return types, hp
+
+    @classmethod
+    def from_arrays(cls, first_row: int, types: np.ndarray, hp: np.ndarray,
+                    chunk_rows: int = WORLD_CHUNK_ROWS) -> "WorldGrid":
+        """Сетка из готовых массивов (строки с first_row) — копированием по чанкам."""
+        grid = cls(cols=types.shape[1], chunk_rows=chunk_rows)
+        grid.first_row = first_row
+        grid.end_row = first_row + len(types)
+        for chunk, src, dst in grid._chunk_slices():
+            grid._types[chunk] = np.zeros((chunk_rows, grid.cols), dtype=np.uint8)
+            grid._hp[chunk] = np.zeros((chunk_rows, grid.cols), dtype=np.int16)
+            grid._types[chunk][src] = types[dst]
+            grid._hp[chunk][src] = hp[dst]
+        grid.dirty_rows = set(range(grid.first_row, grid.end_row))
+        return grid
+
+    @property
+    def nbytes(self) -> int:
+        """Память под данные клеток (без накладных расходов dict)."""
+        return sum(a.nbytes for a in self._types.values()) + sum(a.nbytes for a in self._hp.values())